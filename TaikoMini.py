@@ -305,6 +305,8 @@ def main():
                 game_should_run = False
         # --- End of single song loop ---
     
+    # 保存运行期间修改过的设置
+    game_settings.flush()
     pygame.quit()
     sys.exit()
 
@@ -204,6 +204,10 @@ class TaikoGame:
             print(f"[Lyric] No lyric file found (searched for .srt and .lrc)")
         
         self.lyric_renderer = LyricRenderer(screen)
+        if self.lyric_parser:
+            # 加载阶段预渲染全部歌词，游戏中切换歌词不再逐帧渲染（LRC/SRT 条目最后一项均为文本）
+            lyric_entries = getattr(self.lyric_parser, 'lyrics', None) or self.lyric_parser.subtitles
+            self.lyric_renderer.prerender(entry[-1] for entry in lyric_entries)
         
         # 初始化结算画面渲染器
         self.resource_loader = ResourceLoader()
@@ -1074,7 +1078,7 @@ class TaikoGame:
         
         # 检查是否到达结束时间
         end_note = self.notes[end_idx]
-        end_time = end_note.hit_ms if hasattr(end_note, 'hit_ms') else end_note.time_ms
+        end_time = end_note.hit_ms
         
         if game_time >= end_time:
             # 连打结束 - 不额外加分（每次击打已经加了100分）
@@ -1399,7 +1403,7 @@ class TaikoGame:
             audio_time = self.timing_manager.get_audio_time()
             # 歌词需要提前显示，动画完成时正好对应时间戳
             animation_duration = self.lyric_renderer.get_animation_duration()
-            adjusted_time = audio_time + animation_duration
+            adjusted_time = int(audio_time + animation_duration)  # 歌词时间戳为整数毫秒
             current_lyric = self.lyric_parser.get_lyric_at_time(adjusted_time)
             self.lyric_renderer.draw_lyric(current_lyric)
 
@@ -238,7 +238,7 @@ class InputHandler:
             return
         
         # 计算时间差
-        note_time = note.hit_ms if hasattr(note, 'hit_ms') else note.time_ms
+        note_time = note.hit_ms
         timing_diff = abs(game_time - note_time)
         
         # 在完美窗口内自动击打
@@ -3,10 +3,12 @@
 负责所有游戏元素的绘制：音符、鼓、UI、动画等
 """
 
+import bisect
 import pygame
+from itertools import islice
 from pathlib import Path
 from collections import OrderedDict
-from .note_pattern_manager import NotePatternManager
+from .note_pattern_manager import NotePatternManager, select_note_pattern
 from .game_settings import GameSettings
 
 
@@ -43,9 +45,69 @@ DARK_GRAY = (50, 50, 50)
 # 布局常量
 GAME_AREA_RATIO = 0.20
 JUDGE_X_RATIO = 0.15
+SCORE_SCALE = 0.6  # 分数数字缩放（缩小60%）
+
+# 判定文字动画表（按60fps帧号索引）：3帧移动 + 10帧停留 + 5帧渐隐 = 18帧
+JUDGE_ANIM_FRAMES = 18
+JUDGE_FADE_START_FRAME = 13  # 从第13帧开始渐隐
+JUDGE_FADE_FRAMES = 5  # 渐隐5帧
+# Y轴偏移：0 → 上2px → 下4px（相对初始位置为+6），然后停留在+4
+_JUDGE_Y_OFFSET = (0, -2, 6) + (4,) * (JUDGE_ANIM_FRAMES - 3)
+# 透明度：第13-17帧渐隐（255 → 50，之后不再绘制）
+_JUDGE_ALPHA = (255,) * JUDGE_FADE_START_FRAME + tuple(
+    int(255 * (1.0 - (i - JUDGE_FADE_START_FRAME) / JUDGE_FADE_FRAMES))
+    for i in range(JUDGE_FADE_START_FRAME, JUDGE_ANIM_FRAMES)
+)
 # NOTE_LEAD_TIME 已删除，统一使用 distance 参数
 
 
+def cull_drumrolls(start_notes, start_times, end_times, pxms_start, pxms_end, types,
+                   game_time, judge_x, right_boundary, first=0):
+    """
+    连打条可见性裁剪（纯数值计算，不涉及pygame对象）
+    
+    参数:
+        start_notes: 连打开始音符（只用于读取气球的 popped 状态）
+        start_times/end_times: 开始/结束时间（毫秒）
+        pxms_start/pxms_end: 开始/结束音符每毫秒移动的像素
+        types: 连打原始类型
+        game_time: 当前游戏时间
+        judge_x: 判定圈X坐标
+        right_boundary: 右侧渲染边界
+        first: 从第几个连打开始检查（之前的连打已全部结束）
+        
+    返回:
+        list: 可见连打条 [(x, end_x, note_type), ...]
+    """
+    visible = []
+    arrays = (start_notes, start_times, end_times, pxms_start, pxms_end, types)
+    if first:
+        arrays = [islice(a, first, None) for a in arrays]
+    for start_note, start_time, end_time, pixels_per_ms, end_pixels_per_ms, original_type in zip(*arrays):
+        # 气球连打特殊处理：已打爆或过了结束时间后不再显示
+        if original_type in (7, 9):
+            if game_time > end_time or getattr(start_note, 'popped', False):
+                continue
+        # 普通连打：超过结束时间200ms后不再显示
+        elif game_time > end_time + 200:
+            continue
+        
+        # 只有当连打条的起始点在屏幕范围内，或者连打条横跨屏幕时才绘制。
+        # 可见的连打条必须满足 end_x > x，所以"两端都在右边界外"等价于 x > right_boundary，
+        # 起点越界时无需再计算 end_x
+        x = round(judge_x + (start_time - game_time) * pixels_per_ms)
+        if x > right_boundary:
+            continue
+        
+        end_x = round(judge_x + (end_time - game_time) * end_pixels_per_ms)
+        if end_x <= x:
+            continue
+        
+        # (x, end_x, note_type)，使用保存的原始类型
+        visible.append((x, end_x, original_type))
+    return visible
+
+
 class GameRenderer:
     """
     游戏渲染器
@@ -129,6 +191,7 @@ class GameRenderer:
         
         # 判定文字图片
         self.judgment_images = {}  # 判定文字图片 {"Perfect": img, "Good": img, "OK": img}
+        self._judgment_images_large = {}  # 超大音符用的2倍判定图片（预先缩放）
         
         # 判定文字动画状态
         self.judgment_animation = {
@@ -141,6 +204,21 @@ class GameRenderer:
         # 击打动画列表 (image, start_time, duration, is_big, blend_mode)
         self.active_animations = []
         
+        # 透明度专用副本 {id(模板图片): (模板图片, 副本)}
+        # set_alpha 不修改像素，每个模板保留一份副本即可，避免每帧 copy()
+        self._alpha_scratch = {}
+        # 金色特效（BLEND_RGB_ADD）的可复用临时Surface，只在尺寸不足时重新分配
+        self._glow_scratch = None
+        # 分数HUD缓存：分数变化时才重新拼合数字，其余帧只blit一张图
+        self._last_score = None
+        self._score_cache_surface = None
+        # 判定文字合成缓存 {(判定文字, alpha, 是否超大): surface}（LRU）
+        self._judgment_surface_cache = OrderedDict()
+        self.max_judgment_cache_size = 20
+        # 击打动画缩放帧缓存 {(id(模板图片), 宽, 高): surface}（LRU）
+        self._scaled_anim_cache = OrderedDict()
+        self.max_scaled_anim_cache_size = 128
+        
         # === GPU加速渲染 ===
         # 音符精灵组
         self.note_sprite_group = pygame.sprite.Group()
@@ -155,6 +233,27 @@ class GameRenderer:
         
         # 连打图案缓存
         self.drumroll_textures = {}
+        # 连打条本帧待绘制的 blit 列表（复用同一个list，每帧一次 blits）
+        self._frame_blit_batch = []
+        # 连打三段纹理缓存 {(body名, front名, tail名): (body, front, tail)}
+        self._drumroll_texture_trio_cache = {}
+        # 连打图案名称映射 {note_type: (body, front, tail)}，只构建一次
+        self._tex_map_static = {
+            5: ('rapid', 'front', 'rapid_tail'),                 # 5~8 普通连打
+            6: ('big_rapid', 'big_front2', 'big_rapid_tail'),    # 6~8 大连打
+            7: ('ballon_tail', 'ballon_front', 'ballon_tail2'),  # 7~8 气球
+            9: ('ballon_tail', 'ballon_front', 'ballon_tail2'),  # 9~8 气球
+        }
+        # 连击>20时front使用动态动画 {note_type: (第0帧, 第1帧)}，第0/1帧对应 front2/front3
+        self._anim_frames_per_type = {
+            5: (('rapid', 'front2', 'rapid_tail'),
+                ('rapid', 'front3', 'rapid_tail')),                   # 5~8 普通连打 front动画
+            6: (('big_rapid', 'big_front2', 'big_rapid_tail'),) * 2,  # 6~8 大连打（没有front3）
+            7: (('ballon_tail', 'ballon_front2', 'ballon_tail2'),
+                ('ballon_tail', 'ballon_front3', 'ballon_tail2')),    # 7~8 气球 front动画
+            9: (('ballon_tail', 'ballon_front2', 'ballon_tail2'),
+                ('ballon_tail', 'ballon_front3', 'ballon_tail2')),    # 9~8 气球 front动画
+        }
         
         # 加载资源
         self.load_resources()
@@ -217,11 +316,63 @@ class GameRenderer:
                 except Exception as e:
                     print(f"Warning: Could not load judgment image {filename}: {e}")
             
+            # 超大音符的判定图片放大2倍，缩放比例固定，加载时缩放一次
+            self._judgment_images_large = {
+                judgment: pygame.transform.smoothscale(
+                    img, (img.get_width() * 2, img.get_height() * 2)
+                ).convert_alpha()
+                for judgment, img in self.judgment_images.items()
+            }
+            
             print("OK - Renderer resources loaded")
             
         except Exception as e:
             print(f"Error loading renderer resources: {e}")
     
+    def _get_alpha_scratch(self, img):
+        """
+        获取模板图片的专用副本，用于 set_alpha 后绘制
+        
+        模板图片可能在别处共享，不能直接修改其透明度；副本按模板缓存，
+        只在第一次使用时复制一次。
+        """
+        entry = self._alpha_scratch.get(id(img))
+        if entry is None or entry[0] is not img:
+            # 保存模板引用，保证 id 在缓存期间不会被复用
+            entry = (img, img.convert_alpha())
+            self._alpha_scratch[id(img)] = entry
+        return entry[1]
+    
+    def _get_glow_scratch(self, size):
+        """获取至少为指定尺寸的临时Surface（跨帧复用）"""
+        scratch = self._glow_scratch
+        if scratch is None or scratch.get_width() < size[0] or scratch.get_height() < size[1]:
+            if scratch is not None:
+                size = (max(size[0], scratch.get_width()), max(size[1], scratch.get_height()))
+            scratch = pygame.Surface(size, pygame.SRCALPHA)
+            self._glow_scratch = scratch
+        return scratch
+    
+    def _get_scaled_anim_frame(self, img, pulse_size):
+        """
+        获取缩放后的击打动画帧（LRU缓存）
+        
+        动画时长固定，每个模板只会出现十几种缩放尺寸，缓存后无需每帧 smoothscale。
+        模板来自 self.hit_anims，生命周期与渲染器相同，id(img) 可作为缓存键。
+        """
+        cache_key = (id(img), pulse_size[0], pulse_size[1])
+        cache = self._scaled_anim_cache
+        frame = cache.get(cache_key)
+        if frame is not None:
+            cache.move_to_end(cache_key)
+            return frame
+        
+        frame = pygame.transform.smoothscale(img, pulse_size)
+        cache[cache_key] = frame
+        if len(cache) > self.max_scaled_anim_cache_size:
+            cache.popitem(last=False)
+        return frame
+    
     def _clean_alpha_channel(self, surf):
         """清理alpha通道（防止additive blend伪影）"""
         cleaned_surf = surf.copy()
@@ -314,6 +465,8 @@ class GameRenderer:
         self.note_sprite_group.empty()
         self.note_texture_cache.clear()
         self.drumroll_surface_cache.clear()
+        self._alpha_scratch.clear()
+        self._scaled_anim_cache.clear()
         # 清空位置缓存防止内存泄漏
         self.position_cache.clear()
         self.last_game_time = -1
@@ -417,14 +570,14 @@ class GameRenderer:
             bars_to_draw = []
             
             for bar in bars:
-                bar_time = bar.hit_ms if hasattr(bar, 'hit_ms') else (bar.time_ms if hasattr(bar, 'time_ms') else 0)
+                bar_time = bar.hit_ms
                 time_until_bar = bar_time - game_time
                 
                 if time_until_bar < -200:
                     continue
                 
                 # 使用小节线自带的 pixels_per_frame_x 计算位置
-                if not hasattr(bar, 'pixels_per_frame_x') or bar.pixels_per_frame_x == 0:
+                if bar.pixels_per_frame_x == 0:
                     continue
                 
                 pixels_per_ms = bar.pixels_per_frame_x * 0.06  # 60fps -> 0.06 = 60/1000
@@ -533,14 +686,13 @@ class GameRenderer:
             if note.type == -1:  # 已击打
                 continue
             
-            note_time = note.hit_ms if hasattr(note, 'hit_ms') else note.time_ms
-            time_until_hit = note_time - game_time
+            time_until_hit = note.hit_ms - game_time
             
             if time_until_hit < -200 or note.type == -1:
                 continue
             
             # 使用音符自带的 pixels_per_frame_x 计算位置
-            if not hasattr(note, 'pixels_per_frame_x') or note.pixels_per_frame_x == 0:
+            if note.pixels_per_frame_x == 0:
                 continue
             
             # 使用精确的像素每毫秒计算（基于BPM，与帧率无关）
@@ -587,7 +739,7 @@ class GameRenderer:
             y = note_info['y']
             
             # 获取预渲染的音符纹理（传入combo、game_time和is_super_large）
-            is_super_large = getattr(note, 'is_super_large', False)
+            is_super_large = note.is_super_large
             texture = self._get_note_texture(note.type, combo, game_time, is_super_large)
             if texture:
                 # 如果是超大音符，添加旋转效果
@@ -632,28 +784,8 @@ class GameRenderer:
         Returns:
             str: 图案名称
         """
-        # 连击>20时，使用动态动画（每200ms切换一次）
-        if combo > 20:
-            # 根据游戏时间计算当前帧（200ms一帧，2帧循环）
-            frame = int(game_time / 200) % 2  # 0 or 1
-            suffix = 2 + frame  # 2 or 3
-            
-            pattern_mapping = {
-                1: f'don{suffix}',      # don2 或 don3
-                2: f'ka{suffix}',       # ka2 或 ka3
-                3: f'big_don{suffix}',  # big_don2 或 big_don3
-                4: f'big_ka{suffix}',   # big_ka2 或 big_ka3
-            }
-        else:
-            # 连击<=20时，使用静态图案
-            pattern_mapping = {
-                1: 'don',        # don1.png
-                2: 'a',          # a1.png (ka1.png)
-                3: 'big_don1',   # big_don1.png
-                4: 'big_ka1',    # big_ka1.png
-            }
-        
-        return pattern_mapping.get(note_type, '')
+        # 静态/动画图案均为预建的查找表，不再每次调用构建字典和格式化字符串
+        return select_note_pattern(note_type, combo, game_time)
     
     def _load_drumroll_texture(self, texture_name):
         """
@@ -685,7 +817,7 @@ class GameRenderer:
     
     def _draw_drumroll_with_texture(self, start_x, end_x, y, body_texture, front_texture, tail_texture, note_type, game_time):
         """
-        使用纹理绘制连打条
+        使用纹理绘制连打条（只收集到 self._frame_blit_batch，由调用者统一 blits）
         
         参数:
             start_x: 起始X坐标（连打开始音符的中心）
@@ -697,6 +829,9 @@ class GameRenderer:
             note_type: 音符类型
             game_time: 当前游戏时间（用于气球抖动动画）
         """
+        # 按绘制顺序追加 (surface, dest) 或 (surface, dest, area)，顺序即图层顺序
+        batch = self._frame_blit_batch
+        
         # 气球连打（type 7和9）特殊处理：移动到判定线后固定并抖动
         if note_type in [7, 9]:
             # 获取纹理尺寸
@@ -713,8 +848,7 @@ class GameRenderer:
             
             # 绘制前端图案，几何中心对齐
             if front_texture:
-                front_rect = front_texture.get_rect(center=(display_x, y))
-                self.screen.blit(front_texture, front_rect)
+                batch.append((front_texture, front_texture.get_rect(center=(display_x, y))))
             
             # 使用游戏时间来决定显示哪个抖动动画帧（每100ms切换一次）
             animation_frame = int(game_time / 100) % 2
@@ -728,8 +862,7 @@ class GameRenderer:
             # 前端右边缘 = display_x + front_width // 2
             if balloon_texture:
                 balloon_x = display_x + front_width // 2 + balloon_width // 2
-                balloon_rect = balloon_texture.get_rect(center=(balloon_x, y))
-                self.screen.blit(balloon_texture, balloon_rect)
+                batch.append((balloon_texture, balloon_texture.get_rect(center=(balloon_x, y))))
             return
         
         # 普通连打和大连打（type 5和6）：显示完整的连打条
@@ -737,14 +870,11 @@ class GameRenderer:
         body_width = body_texture.get_width()
         body_height = body_texture.get_height()
         front_width = front_texture.get_width()
-        front_height = front_texture.get_height()
         tail_width = tail_texture.get_width()
-        tail_height = tail_texture.get_height()
         
         # 直接使用几何中心对齐（用户会手动切图调整）
         # 1. 先绘制尾端图案（最底层）- 几何中心对齐在 end_x
-        tail_rect = tail_texture.get_rect(center=(end_x, y))
-        self.screen.blit(tail_texture, tail_rect)
+        batch.append((tail_texture, tail_texture.get_rect(center=(end_x, y))))
         
         # 前端位置：几何中心对齐在 start_x
         front_x = start_x
@@ -759,6 +889,7 @@ class GameRenderer:
         # 3. 平铺主体纹理（左对齐，中间层）
         if body_length > 0:
             num_tiles = int(body_length / body_width) + 1
+            tile_y = y - body_height // 2  # midleft 对齐
             
             for i in range(num_tiles):
                 tile_x = body_start_x + i * body_width
@@ -767,18 +898,14 @@ class GameRenderer:
                 if tile_x + body_width > body_end_x:
                     clip_width = body_end_x - tile_x
                     if clip_width > 0:
-                        # 创建裁剪后的纹理（左对齐）
-                        clipped_texture = body_texture.subsurface((0, 0, int(clip_width), body_height))
-                        tile_rect = clipped_texture.get_rect(midleft=(tile_x, y))
-                        self.screen.blit(clipped_texture, tile_rect)
+                        # 用 area 参数裁剪（左对齐），无需创建 subsurface
+                        batch.append((body_texture, (tile_x, tile_y), (0, 0, clip_width, body_height)))
                 else:
                     # 完整的tile（左对齐）
-                    tile_rect = body_texture.get_rect(midleft=(tile_x, y))
-                    self.screen.blit(body_texture, tile_rect)
+                    batch.append((body_texture, (tile_x, tile_y)))
         
         # 4. 最后绘制前端图案（最顶层）- 逻辑中心对齐在 start_x
-        front_rect = front_texture.get_rect(center=(front_x, y))
-        self.screen.blit(front_texture, front_rect)
+        batch.append((front_texture, front_texture.get_rect(center=(front_x, y))))
     
     def _get_drumroll_end_circle(self, note_type):
         """获取连打条结束圈纹理（使用tail图案）"""
@@ -813,6 +940,52 @@ class GameRenderer:
         self.drumroll_surface_cache[cache_key] = surface
         return surface
     
+    def _build_drumroll_arrays(self, notes):
+        """
+        配对连打开始/结束音符，并把逐帧需要的数据整理成并行列表（SoA）
+        
+        谱面加载后时间和速度不再变化，因此 hit_ms、每毫秒像素数和原始类型
+        只需在建缓存时读取一次，绘制时不再访问音符属性。
+        
+        参数:
+            notes: 音符列表
+            
+        返回:
+            tuple: (start_notes, start_times, end_times, pxms_start, pxms_end, types, end_time_bounds)
+            end_time_bounds[i] 为前 i+1 个连打结束时间的最大值（单调不减，可二分查找）
+        """
+        start_notes = []
+        start_times = []
+        end_times = []
+        pxms_start = []
+        pxms_end = []
+        types = []
+        for i, note in enumerate(notes):
+            if note.type in [5, 6, 7, 9]:
+                for j in range(i + 1, len(notes)):
+                    end_note = notes[j]
+                    if end_note.type == 8:
+                        # 使用连打条自带的 pixels_per_frame_x 计算位置，速度为0的连打永远不可见
+                        if note.pixels_per_frame_x == 0:
+                            break
+                        pixels_per_ms = note.pixels_per_frame_x * 0.06  # 60fps -> 0.06 = 60/1000
+                        end_pixels_per_ms = (end_note.pixels_per_frame_x * 0.06) if end_note.pixels_per_frame_x else pixels_per_ms
+                        start_notes.append(note)
+                        start_times.append(note.hit_ms)
+                        end_times.append(end_note.hit_ms)
+                        pxms_start.append(pixels_per_ms)
+                        pxms_end.append(end_pixels_per_ms)
+                        # 保存原始类型，防止音符被标记为-1后丢失类型信息
+                        types.append(note.type)
+                        break
+        
+        end_time_bounds = []
+        latest_end = float('-inf')
+        for end_time in end_times:
+            latest_end = max(latest_end, end_time)
+            end_time_bounds.append(latest_end)
+        return start_notes, start_times, end_times, pxms_start, pxms_end, types, end_time_bounds
+    
     def draw_drumrolls(self, notes, game_time, combo=0, playback_speed=1.0):
         """
         绘制连打条（优化：减少pygame.draw调用）
@@ -831,122 +1004,85 @@ class GameRenderer:
         # 对于分歧谱面，列表对象不变但内容会改变，所以需要同时检查长度
         cache_key = (id(notes), len(notes))
         if cache_key not in self._drumroll_pairs_cache:
-            drumroll_pairs = []
-            for i, note in enumerate(notes):
-                if note.type in [5, 6, 7, 9]:
-                    for j in range(i + 1, len(notes)):
-                        if notes[j].type == 8:
-                            # 保存原始类型，防止音符被标记为-1后丢失类型信息
-                            original_type = note.type
-                            drumroll_pairs.append((note, notes[j], original_type))
-                            break
-            self._drumroll_pairs_cache[cache_key] = drumroll_pairs
+            self._drumroll_pairs_cache[cache_key] = self._build_drumroll_arrays(notes)
+        
+        # 结构数组（SoA）：每个字段一个并行列表，逐帧只做算术和比较
+        start_notes, start_times, end_times, pxms_start, pxms_end, types, end_time_bounds = self._drumroll_pairs_cache[cache_key]
+        
+        # 快速路径：二分跳过已全部结束（超过结束时间200ms）的连打，没有剩余连打时直接返回
+        first = bisect.bisect_left(end_time_bounds, game_time - 200)
+        if first == len(types):
+            return
         
-        drumroll_pairs = self._drumroll_pairs_cache[cache_key]
+        # 减速时需要更大的渲染边界（连打条会在更远处出现）
+        right_boundary = self.screen_width + (100 / max(playback_speed, 0.1))
         
         # 批量收集需要绘制的连打条
-        drumrolls_to_draw = []
+        drumrolls_to_draw = cull_drumrolls(
+            start_notes, start_times, end_times, pxms_start, pxms_end, types,
+            game_time, self.judge_x, right_boundary, first
+        )
         
-        for start_note, end_note, original_type in drumroll_pairs:
-            start_time = start_note.hit_ms if hasattr(start_note, 'hit_ms') else start_note.time_ms
-            end_time = end_note.hit_ms if hasattr(end_note, 'hit_ms') else end_note.time_ms
-            
-            # 气球连打特殊处理：检查是否已打爆
-            if original_type in [7, 9]:
-                # 检查气球是否已被打爆
-                if hasattr(start_note, 'popped') and start_note.popped:
-                    continue
-                # 气球过了结束时间后不再显示
-                if game_time > end_time:
-                    continue
-            else:
-                # 普通连打：超过结束时间200ms后不再显示
-                if game_time > end_time + 200:
-                    continue
-            
-            time_until_hit = start_time - game_time
-            
-            # 使用连打条自带的 pixels_per_frame_x 计算位置
-            if not hasattr(start_note, 'pixels_per_frame_x') or start_note.pixels_per_frame_x == 0:
-                continue
-            
-            pixels_per_ms = start_note.pixels_per_frame_x * 0.06  # 60fps -> 0.06 = 60/1000
-            x = round(self.judge_x + (time_until_hit * pixels_per_ms))
-            
-            end_time_diff = end_time - game_time
-            end_pixels_per_ms = (end_note.pixels_per_frame_x * 0.06) if hasattr(end_note, 'pixels_per_frame_x') else pixels_per_ms
-            end_x = round(self.judge_x + (end_time_diff * end_pixels_per_ms))
-            
-            if end_x <= x:
-                continue
-            
-            # 减速时需要更大的渲染边界（连打条会在更远处出现）
-            right_boundary = self.screen_width + (100 / max(playback_speed, 0.1))
-            # 只有当连打条的起始点在屏幕范围内，或者连打条横跨屏幕时才绘制
-            if x > right_boundary and end_x > right_boundary:
-                continue
-            
-            drumrolls_to_draw.append({
-                'x': x,
-                'end_x': end_x,
-                'note_type': original_type  # 使用保存的原始类型
-            })
+        # 连击>20时，front部分使用动态动画（200ms一帧，2帧循环）
+        use_anim_frames = combo > 20
+        frame = int(game_time // 200) & 1  # 0 or 1
+        
+        # 循环内不变的属性提前取到局部变量
+        screen = self.screen
+        y = self.judge_y
+        anim_frames_per_type = self._anim_frames_per_type
+        tex_map_static = self._tex_map_static
+        trio_cache = self._drumroll_texture_trio_cache
+        
+        batch = self._frame_blit_batch
+        batch.clear()
         
         # 批量绘制连打条（使用图案）
-        for dr in drumrolls_to_draw:
-            x = dr['x']
-            end_x = dr['end_x']
-            note_type = dr['note_type']
-            
-            y = self.judge_y
-            width = int(end_x - x)
+        for x, end_x, note_type in drumrolls_to_draw:
+            width = end_x - x  # round() 已返回整数
             
             if width > 0:
                 # 根据音符类型和combo选择图案 (body, front, tail)
-                # 连击>20时，front部分使用动态动画
-                if combo > 20:
-                    # 根据游戏时间计算当前帧（200ms一帧，2帧循环）
-                    frame = int(game_time / 200) % 2  # 0 or 1
-                    suffix = 2 + frame  # 2 or 3
-                    texture_mapping = {
-                        5: ('rapid', f'front{suffix}', 'rapid_tail'),           # 5~8 普通连打 front动画
-                        6: ('big_rapid', 'big_front2', 'big_rapid_tail'),        # 6~8 大连打（没有front3）
-                        7: ('ballon_tail', f'ballon_front{suffix}', 'ballon_tail2'),  # 7~8 气球 front动画
-                        9: ('ballon_tail', f'ballon_front{suffix}', 'ballon_tail2'),  # 9~8 气球 front动画
-                    }
+                if use_anim_frames:
+                    texture_names = anim_frames_per_type[note_type][frame]
                 else:
-                    texture_mapping = {
-                        5: ('rapid', 'front', 'rapid_tail'),           # 5~8 普通连打
-                        6: ('big_rapid', 'big_front2', 'big_rapid_tail'),  # 6~8 大连打
-                        7: ('ballon_tail', 'ballon_front', 'ballon_tail2'),  # 7~8 气球
-                        9: ('ballon_tail', 'ballon_front', 'ballon_tail2'),  # 9~8 气球
-                    }
-                
-                texture_names = texture_mapping.get(note_type, (None, None, None))
-                body_texture_name, front_texture_name, tail_texture_name = texture_names
+                    texture_names = tex_map_static[note_type]
                 
-                # 加载图案纹理
-                body_texture = self._load_drumroll_texture(body_texture_name) if body_texture_name else None
-                front_texture = self._load_drumroll_texture(front_texture_name) if front_texture_name else None
-                tail_texture = self._load_drumroll_texture(tail_texture_name) if tail_texture_name else None
+                # 加载图案纹理（三段纹理一次字典查找，未命中时才逐个加载）
+                trio = trio_cache.get(texture_names)
+                if trio is None:
+                    trio = tuple(
+                        self._load_drumroll_texture(name) if name else None
+                        for name in texture_names
+                    )
+                    trio_cache[texture_names] = trio
+                body_texture, front_texture, tail_texture = trio
                 
                 if body_texture and tail_texture and (front_texture or note_type in [7, 9]):
                     # 使用图案绘制连打条（气球只需要body和tail动画帧）
                     self._draw_drumroll_with_texture(
-                        int(x), int(end_x), y, 
+                        x, end_x, y,
                         body_texture, front_texture, tail_texture, note_type, game_time
                     )
                 else:
-                    # 如果图案加载失败，使用原来的矩形绘制
+                    # 如果图案加载失败，使用原来的矩形绘制（先画出已收集的纹理，保持图层顺序）
+                    if batch:
+                        screen.blits(batch, doreturn=False)
+                        batch.clear()
                     color = YELLOW if note_type in [7, 9] else (RED if note_type == 5 else BLUE)
                     bar_height = 40 if note_type in [7, 9] else 30
-                    pygame.draw.rect(self.screen, color, (int(x), y - bar_height//2, width, bar_height))
-                    pygame.draw.rect(self.screen, WHITE, (int(x), y - bar_height//2, width, bar_height), 3)
+                    pygame.draw.rect(screen, color, (x, y - bar_height//2, width, bar_height))
+                    pygame.draw.rect(screen, WHITE, (x, y - bar_height//2, width, bar_height), 3)
                     
                     # 如果使用矩形，仍需绘制结束圈
                     end_circle = self._get_drumroll_end_circle(note_type)
-                    circle_rect = end_circle.get_rect(center=(int(end_x), y))
-                    self.screen.blit(end_circle, circle_rect)
+                    circle_rect = end_circle.get_rect(center=(end_x, y))
+                    batch.append((end_circle, circle_rect))
+        
+        # 一次 blits 绘制本帧所有连打条纹理
+        if batch:
+            screen.blits(batch, doreturn=False)
+            batch.clear()
     
     def draw_drum(self, drum_animation_times, game_time):
         """
@@ -965,9 +1101,14 @@ class GameRenderer:
             y_offset = sink_amount
         
         # 绘制鼓底图
-        if self.scaled_drum_img:
-            rect = self.scaled_drum_img.get_rect(center=(self.drum_center_x, self.drum_center_y + y_offset))
-            self.screen.blit(self.scaled_drum_img, rect)
+        scaled_drum_img = self.scaled_drum_img
+        if scaled_drum_img:
+            screen = self.screen
+            scaled_don_hit_img = self.scaled_don_hit_img
+            scaled_kat_hit_img = self.scaled_kat_hit_img
+            
+            rect = scaled_drum_img.get_rect(center=(self.drum_center_x, self.drum_center_y + y_offset))
+            screen.blit(scaled_drum_img, rect)
             
             hit_flash_duration = 150
             
@@ -975,23 +1116,23 @@ class GameRenderer:
             last_don_hit = max(drum_animation_times['don_left'], drum_animation_times['don_right'])
             don_elapsed = game_time - last_don_hit
             
-            if don_elapsed < hit_flash_duration and self.scaled_don_hit_img:
+            if don_elapsed < hit_flash_duration and scaled_don_hit_img:
                 fade = 1.0 - (don_elapsed / hit_flash_duration)
                 alpha = int(255 * max(0.0, min(1.0, fade)))
-                hit_img = self.scaled_don_hit_img.copy()
+                hit_img = self._get_alpha_scratch(scaled_don_hit_img)
                 hit_img.set_alpha(alpha)
-                self.screen.blit(hit_img, rect)
+                screen.blit(hit_img, rect)
             
             # 咔闪光
             last_kat_hit = max(drum_animation_times['kat_left'], drum_animation_times['kat_right'])
             kat_elapsed = game_time - last_kat_hit
             
-            if kat_elapsed < hit_flash_duration and self.scaled_kat_hit_img:
+            if kat_elapsed < hit_flash_duration and scaled_kat_hit_img:
                 fade = 1.0 - (kat_elapsed / hit_flash_duration)
                 alpha = int(255 * max(0.0, min(1.0, fade)))
-                hit_img = self.scaled_kat_hit_img.copy()
+                hit_img = self._get_alpha_scratch(scaled_kat_hit_img)
                 hit_img.set_alpha(alpha)
-                self.screen.blit(hit_img, rect)
+                screen.blit(hit_img, rect)
     
     def draw_hit_animations(self, game_time):
         """
@@ -1000,13 +1141,19 @@ class GameRenderer:
         参数:
             game_time: 当前游戏时间
         """
-        for anim in self.active_animations[:]:
+        # 循环内不变的属性提前取到局部变量
+        screen = self.screen
+        judge_center = (self.judge_x, self.judge_y)
+        
+        # 一次遍历收集仍在播放的动画，结束后整体替换列表（避免逐个remove的O(N²)）
+        survivors = []
+        for anim in self.active_animations:
             img, start_time, duration, is_big, blend_mode = anim
             elapsed = game_time - start_time
             
             if elapsed >= duration:
-                self.active_animations.remove(anim)
                 continue
+            survivors.append(anim)
             
             progress = elapsed / duration
             fade = 1.0 - progress
@@ -1020,21 +1167,28 @@ class GameRenderer:
             if pulse_size[0] <= 0 or pulse_size[1] <= 0:
                 continue
             
-            final_img = pygame.transform.smoothscale(img, pulse_size)
-            rect = final_img.get_rect(center=(self.judge_x, self.judge_y))
+            # 缓存的帧可能被多个动画共享，下面每次绘制前都会重新设置alpha
+            final_img = self._get_scaled_anim_frame(img, pulse_size)
+            rect = final_img.get_rect(center=judge_center)
             
             if blend_mode == pygame.BLEND_RGB_ADD:
                 # 金色特效强度减少60%
-                glow_img = final_img.copy()
+                # 在复用的临时Surface上调暗，不再每帧 copy() 整张图片
+                glow_img = self._get_glow_scratch(pulse_size)
+                area = (0, 0, pulse_size[0], pulse_size[1])
+                glow_img.fill((0, 0, 0, 0), area)
+                glow_img.blit(final_img, (0, 0), special_flags=pygame.BLEND_RGBA_ADD)
                 fade_value = int(255 * fade * 0.5)  # 原本是 fade，现在是 fade * 0.4 (减少60%)
                 fade_value = max(0, min(255, fade_value))  # Clamp value
-                glow_img.fill((fade_value, fade_value, fade_value), special_flags=pygame.BLEND_RGB_MULT)
-                self.screen.blit(glow_img, rect, special_flags=blend_mode)
+                glow_img.fill((fade_value, fade_value, fade_value), area, special_flags=pygame.BLEND_RGB_MULT)
+                screen.blit(glow_img, rect, area, special_flags=blend_mode)
             else:
                 alpha = int(255 * fade)
                 alpha = max(0, min(255, alpha))  # Clamp value
                 final_img.set_alpha(alpha)
-                self.screen.blit(final_img, rect)
+                screen.blit(final_img, rect)
+        
+        self.active_animations = survivors
     
     def trigger_hit_animation(self, is_big, is_don, game_time):
         """
@@ -1060,6 +1214,23 @@ class GameRenderer:
         if flash_2:
             self.active_animations.append((flash_2, game_time, anim_duration, False, pygame.BLEND_RGB_ADD))
     
+    def _load_score_numbers(self):
+        """加载白色分数数字图片，并预先缩放（缩放比例固定，只需缩放一次）"""
+        self.score_numbers = {}
+        self.score_numbers_scaled = {}
+        score_dir = Path("lib/res/Texture/combo")
+        for digit in range(10):
+            filename = f"combo_1_{digit:02d}.png"
+            try:
+                img = pygame.image.load(str(score_dir / filename)).convert_alpha()
+                self.score_numbers[digit] = img
+            except Exception as e:
+                print(f"Warning: Could not load score digit {filename}: {e}")
+        
+        for digit, img in self.score_numbers.items():
+            new_size = (int(img.get_width() * SCORE_SCALE), int(img.get_height() * SCORE_SCALE))
+            self.score_numbers_scaled[digit] = pygame.transform.smoothscale(img, new_size).convert_alpha()
+    
     def draw_stats(self, score):
         """
         绘制统计信息（使用图片显示分数）
@@ -1069,54 +1240,84 @@ class GameRenderer:
         """
         # 加载白色数字图片（如果还未加载）
         if not hasattr(self, 'score_numbers'):
-            self.score_numbers = {}
-            score_dir = Path("lib/res/Texture/combo")
-            for digit in range(10):
-                filename = f"combo_1_{digit:02d}.png"
-                try:
-                    img = pygame.image.load(str(score_dir / filename)).convert_alpha()
-                    self.score_numbers[digit] = img
-                except Exception as e:
-                    print(f"Warning: Could not load score digit {filename}: {e}")
-        
-        # 转换分数为6位字符串（补0）
-        score_str = f"{score:06d}"
+            self._load_score_numbers()
         
         # 分数位置：音符区下方5px，距离左边15px
         score_x = 15
         score_y = self.game_area_bottom + 5
         
-        # 数字缩放（缩小60%）
-        score_scale = 0.6
+        # 分数变化时才重新拼合（大多数帧分数不变，只需blit一张缓存图）
+        if score != self._last_score or self._score_cache_surface is None:
+            self._score_cache_surface = self._compose_score_surface(score)
+            self._last_score = score
+        
+        self.screen.blit(self._score_cache_surface, (score_x, score_y))
+    
+    def _compose_score_surface(self, score):
+        """
+        把6位分数数字拼合到一张离屏Surface上
+        
+        参数:
+            score: 当前分数
+            
+        返回:
+            pygame.Surface: 拼合后的分数图片
+        """
+        # 转换分数为6位字符串（补0）
+        score_str = f"{score:06d}"
+        
         digit_spacing = -6  # 数字间距（负值=重叠，按比例缩小）
         
-        # 收集所有数字图片
-        digit_images = []
+        # 只计算每个数字的位置，最后一次性批量绘制（顶部对齐，从左到右）
+        scaled_numbers = self.score_numbers_scaled
+        blit_list = []
+        current_x = 0
+        width = 0
+        height = 0
         for digit_char in score_str:
-            digit = int(digit_char)
-            if digit in self.score_numbers:
-                digit_images.append(self.score_numbers[digit])
-        
-        # 逐个绘制数字（从左到右）
-        current_x = score_x
-        for img in digit_images:
-            # 应用缩放
-            if score_scale != 1.0:
-                original_size = img.get_size()
-                new_size = (
-                    int(original_size[0] * score_scale),
-                    int(original_size[1] * score_scale)
-                )
-                score_img = pygame.transform.smoothscale(img, new_size)
-            else:
-                score_img = img.copy()
+            score_img = scaled_numbers.get(int(digit_char))
+            if score_img is None:
+                continue
             
-            # 绘制数字（顶部对齐）
-            num_rect = score_img.get_rect(topleft=(current_x, score_y))
-            self.screen.blit(score_img, num_rect)
+            blit_list.append((score_img, (current_x, 0)))
+            width = max(width, current_x + score_img.get_width())
+            height = max(height, score_img.get_height())
             
             # 移动到下一个数字位置
             current_x += score_img.get_width() + digit_spacing
+        
+        surface = pygame.Surface((max(width, 1), max(height, 1)), pygame.SRCALPHA)
+        # 一次blits调用代替逐个blit，减少Python到C的调用次数
+        surface.blits(blit_list, doreturn=False)
+        return surface
+    
+    def _get_judgment_surface(self, judgment_text, alpha, is_super_large):
+        """
+        获取合成后的判定图片（LRU缓存）
+        
+        动画只有少数几种透明度，合成结果按 (判定文字, alpha, 是否超大) 缓存，
+        命中时无需再缩放或设置透明度。
+        """
+        cache_key = (judgment_text, alpha, is_super_large)
+        cache = self._judgment_surface_cache
+        judge_img = cache.get(cache_key)
+        if judge_img is not None:
+            cache.move_to_end(cache_key)
+            return judge_img
+        
+        # 如果是超大音符，使用预先放大2倍的判定图片
+        if is_super_large:
+            judge_img = self._judgment_images_large[judgment_text]
+        else:
+            judge_img = self.judgment_images[judgment_text]
+        judge_img = judge_img.copy()  # 复制以便修改alpha
+        # 应用透明度
+        judge_img.set_alpha(alpha)
+        
+        cache[cache_key] = judge_img
+        if len(cache) > self.max_judgment_cache_size:
+            cache.popitem(last=False)
+        return judge_img
     
     def draw_judgment(self, judgment_text, game_time, judgment_time, is_super_large=False):
         """
@@ -1129,59 +1330,25 @@ class GameRenderer:
             is_super_large: 是否是超大音符（JK音符）
         """
         # 动画总时长：3帧移动 + 10帧停留 + 5帧渐隐 = 18帧 ≈ 300ms (at 60fps)
-        ANIMATION_DURATION = 300  # ms
-        FADE_START_FRAME = 13  # 从第13帧开始渐隐
-        FADE_FRAMES = 5  # 渐隐5帧
-        
-        elapsed_time = game_time - judgment_time
+        frame_time = 16.67  # 60fps下每帧时间
+        current_frame = max(0, int((game_time - judgment_time) / frame_time))
+        if current_frame >= JUDGE_ANIM_FRAMES:
+            return
         
-        if elapsed_time < ANIMATION_DURATION:
-            # 使用图片而不是文字
-            if judgment_text in self.judgment_images:
-                judge_img = self.judgment_images[judgment_text].copy()  # 复制以便修改alpha
-                
-                # 如果是超大音符，放大判定图片2倍
-                if is_super_large:
-                    original_size = judge_img.get_size()
-                    scaled_size = (int(original_size[0] * 2.0), int(original_size[1] * 2.0))
-                    judge_img = pygame.transform.smoothscale(judge_img, scaled_size)
-                
-                # 计算Y轴偏移（0 → 上2px → 下4px，然后停留）
-                frame_time = 16.67  # 60fps下每帧时间
-                current_frame = int(elapsed_time / frame_time)
-                
-                if current_frame == 0:
-                    # 第0帧：初始位置
-                    y_offset = 0
-                elif current_frame == 1:
-                    # 第1帧：上移2px
-                    y_offset = -2
-                elif current_frame == 2:
-                    # 第2帧：下移4px（相对初始位置）
-                    y_offset = 6
-                else:
-                    # 第3-12帧：停留在下移4px的位置
-                    y_offset = 4
-                
-                # 计算渐隐alpha值
-                alpha = 255
-                if current_frame >= FADE_START_FRAME:
-                    # 第13-17帧：渐隐
-                    fade_progress = (current_frame - FADE_START_FRAME) / FADE_FRAMES
-                    alpha = int(255 * (1.0 - fade_progress))
-                    alpha = max(0, min(255, alpha))
-                
-                # 应用透明度
-                judge_img.set_alpha(alpha)
-                
-                # 绘制判定图片在判定圈上方（整体上移25px）
-                img_rect = judge_img.get_rect()
-                img_x = self.judge_x - img_rect.width // 2
-                img_y = self.judge_y - img_rect.height - 50 + y_offset  # 在判定圈上方35px（原10px + 上移10px + 再上移15px）
-                
-                self.screen.blit(judge_img, (img_x, img_y))
-            elif judgment_text == "Miss":
-                # Miss不显示判定文字（或可以使用文字渲染）
-                pass
+        # 使用图片而不是文字（Miss不显示判定文字）
+        if judgment_text in self.judgment_images:
+            # Y轴偏移和渐隐alpha值直接查表
+            y_offset = _JUDGE_Y_OFFSET[current_frame]
+            alpha = _JUDGE_ALPHA[current_frame]
+            
+            # 取出已合成（缩放+透明度）的判定图片
+            judge_img = self._get_judgment_surface(judgment_text, alpha, is_super_large)
+            
+            # 绘制判定图片在判定圈上方（整体上移25px）
+            img_rect = judge_img.get_rect()
+            img_x = self.judge_x - img_rect.width // 2
+            img_y = self.judge_y - img_rect.height - 50 + y_offset  # 在判定圈上方35px（原10px + 上移10px + 再上移15px）
+            
+            self.screen.blit(judge_img, (img_x, img_y))
     
 
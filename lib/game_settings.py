@@ -8,13 +8,229 @@ Manages various game parameter settings
 
 from pathlib import Path
 from typing import Dict, Any
-import configparser
+import copy
+import os
 from .paths import config_file
 
 
+def _strip_comment(value: str) -> str:
+    """移除行内注释（# 及其后面的内容）并去除首尾空白"""
+    head, _, _ = value.partition('#')
+    return head.strip()
+
+
+def _to_int(value: str) -> int:
+    return int(_strip_comment(value))
+
+
+def _to_float(value: str) -> float:
+    return float(_strip_comment(value))
+
+
+# 视为"真"的取值（与 configparser 的 getboolean 相同），其余一律为假
+_TRUE_STATES = frozenset(('1', 'yes', 'true', 'on'))
+
+
+def _parse_ini(text: str) -> Dict[str, Dict[str, str]]:
+    """
+    单遍解析 INI 文本
+    
+    与 configparser 的默认格式兼容：分隔符为 "=" 或 ":"（以先出现的为准），
+    缩进的行是上一项的续行（以换行连接）。无法解析的行会打印警告并跳过。
+    值保持原样（不去除行内注释），以便其他模块的段（如 CategoryColors 的 "#RRGGBB"）能原样写回
+    
+    返回:
+        {段名: {键: 原始字符串值}}，键统一小写（与 configparser 一致）
+    """
+    data = {}
+    section = None
+    key = None  # 上一项的键，用于续行
+    for line_number, raw_line in enumerate(text.splitlines(), 1):
+        line = raw_line.strip()
+        if not line:
+            key = None
+            continue
+        if line[0] in '#;':
+            continue
+        if key is not None and raw_line[0] in ' \t':
+            section[key] = f"{section[key]}\n{line}"
+            continue
+        key = None
+        if line[0] == '[' and line[-1] == ']':
+            section = data.setdefault(line[1:-1].strip(), {})
+            continue
+        if section is not None:
+            positions = [pos for pos in (line.find('='), line.find(':')) if pos > 0]
+            if positions:
+                pos = min(positions)
+                key = line[:pos].strip().lower()
+                section[key] = line[pos + 1:].strip()
+                continue
+        print(f"Warning: ignoring unparsed line {line_number} in config: {line}")
+    return data
+
+
+def _format_ini(data: Dict[str, Dict[str, str]]) -> str:
+    """把设置数据格式化为紧凑的 INI 文本（"键=值"，段之间不留空行，多行值写成缩进的续行）"""
+    parts = []
+    for section, options in data.items():
+        parts.append(f"[{section}]\n")
+        for key, value in options.items():
+            if '\n' in value:
+                # 多行值：续行缩进（与 configparser 写出的格式相同）
+                value = value.replace('\n', '\n\t')
+            parts.append(f"{key}={value}\n")
+    return ''.join(parts)
+
+
+def _to_bool(value: str) -> bool:
+    return _strip_comment(value).lower() in _TRUE_STATES
+
+
+def _to_fps(value: str) -> int:
+    # 只允许60或120
+    fps = _to_int(value)
+    return fps if fps in (60, 120) else 60
+
+
+def _to_color(value: str) -> tuple:
+    # "r, g, b, a" -> 0~1 浮点 RGBA
+    r, g, b, a = [int(c.strip()) for c in _strip_comment(value).split(',')]
+    return r / 255.0, g / 255.0, b / 255.0, a / 255.0
+
+
+# 影响缩放结果的基础设置项，修改后需要重新计算 _scaled
+_SCALE_BASE_KEYS = frozenset((
+    'Gameplay.note_distance',
+    'Gameplay.note_scale',
+    'Gameplay.note_area_scale',
+    'Gameplay.judge_circle_scale',
+    'Gameplay.hit_effect_scale',
+    'Gameplay.judge_x_scale',
+))
+
+# 打印设置时的分隔线
+_BANNER = "=" * 30
+
+# 默认设置（写入新配置文件、重置时使用）
+_DEFAULT_SETTINGS = {
+    'Gameplay': {
+        'note_distance': '1600',      # 音符距离
+        'note_scale': '0.8',          # 音符缩放比例
+        'note_speed': '1.0',          # 音符速度倍数
+        'judge_line_position': '0.15', # 判定线位置比例
+        'note_area_scale': '1.0',     # 音符区整体比例
+        'hit_effect_scale': '0.6',    # 击中特效缩放比例
+        'judge_x_scale': '1.0',       # 判定线位置缩放比例
+        'chart_offset': '10',         # 谱面偏移(ms) 正数提前 负数延后
+        'target_fps': '60'            # 目标帧率 可选: 60 或 120
+    },
+    'State': {
+        'last_selected_song': '',
+        'last_selected_difficulty': 'Oni',
+        'auto_play': 'False'
+    },
+    'Audio': {
+        'master_volume': '1.0',       # 主音量
+        'sfx_volume': '1.0',          # 音效音量
+        'music_volume': '1.0'         # 音乐音量
+    },
+    'Display': {
+        'screen_width': '720',        # 屏幕宽度
+        'screen_height': '1280',      # 屏幕高度
+        'fullscreen': 'False'         # 全屏模式
+    },
+    'Graphics': {
+        'game_area_ratio': '0.20',
+        'judge_x_ratio': '0.15',
+        'drum_ratio': '0.48',
+        'drum_y_offset_ratio': '0.20',
+        'don_color': '230, 74, 25, 255',
+        'kat_color': '0, 162, 232, 255'
+    }
+}
+
+# 各设置项的类型转换器，键为 "段.键"
+_FIELD_TYPES = {
+    'Gameplay.note_distance': _to_int,
+    'Gameplay.note_scale': _to_float,
+    'Gameplay.note_speed': _to_float,
+    'Gameplay.judge_line_position': _to_float,
+    'Gameplay.note_area_scale': _to_float,
+    'Gameplay.judge_circle_scale': _to_float,
+    'Gameplay.hit_effect_scale': _to_float,
+    'Gameplay.judge_x_scale': _to_float,
+    'Gameplay.chart_offset': _to_float,
+    'Gameplay.target_fps': _to_fps,
+    'State.last_selected_song': str,
+    'State.last_selected_difficulty': str,
+    'State.auto_play': _to_bool,
+    'Audio.master_volume': _to_float,
+    'Display.screen_width': _to_int,
+    'Display.screen_height': _to_int,
+    'Display.fullscreen': _to_bool,
+    'Graphics.game_area_ratio': _to_float,
+    'Graphics.judge_x_ratio': _to_float,
+    'Graphics.don_color': _to_color,
+    'Graphics.kat_color': _to_color,
+    'GameSettings.default_speed': _to_float,
+    'GameSettings.default_difficulty': str,
+    'DisplaySettings.title_font_size': _to_int,
+    'DisplaySettings.category_font_size': _to_int,
+    'DisplaySettings.title_outline': _to_int,
+    'DisplaySettings.category_outline': _to_int,
+    'LastSelected.category': str,
+}
+
+# (缓存键, 段, 键, 转换器)，加载时按此表直接取值，无需为每个原始键拼接字符串
+_FIELDS = tuple(
+    (cache_key, *cache_key.split('.', 1), converter)
+    for cache_key, converter in _FIELD_TYPES.items()
+)
+
+# 各设置项的默认值（已是目标类型），缺失或无法解析时使用
+_DEFAULTS = {
+    'Gameplay.note_distance': 1200,
+    'Gameplay.note_scale': 0.8,
+    'Gameplay.note_speed': 1.0,
+    'Gameplay.judge_line_position': 0.15,
+    'Gameplay.note_area_scale': 1.0,
+    'Gameplay.judge_circle_scale': 1.0,
+    'Gameplay.hit_effect_scale': 0.6,
+    'Gameplay.judge_x_scale': 1.0,
+    'Gameplay.chart_offset': 10.0,
+    'Gameplay.target_fps': 60,
+    'State.last_selected_song': '',
+    'State.last_selected_difficulty': 'Oni',
+    'State.auto_play': False,
+    'Audio.master_volume': 1.0,
+    'Display.screen_width': 720,
+    'Display.screen_height': 1280,
+    'Display.fullscreen': False,
+    'Graphics.game_area_ratio': 0.20,
+    'Graphics.judge_x_ratio': 0.15,
+    'Graphics.don_color': (230 / 255.0, 74 / 255.0, 25 / 255.0, 1.0),
+    'Graphics.kat_color': (0.0, 162 / 255.0, 232 / 255.0, 1.0),
+    'GameSettings.default_speed': 1.0,
+    'GameSettings.default_difficulty': 'Oni',
+    'DisplaySettings.title_font_size': 46,
+    'DisplaySettings.category_font_size': 20,
+    'DisplaySettings.title_outline': 3,
+    'DisplaySettings.category_outline': 2,
+    'LastSelected.category': '',
+}
+
+
 class GameSettings:
     """游戏设置管理器"""
     
+    # getter 每帧都会被调用，使用 __slots__ 让属性访问走固定槽位
+    __slots__ = (
+        'config_file', '_config_file_str', '_config_dir', '_tmp_file_str',
+        'default_settings', '_data', '_cache', '_scaled',
+        '_target_fps', '_dirty',
+    )
+    
     def __init__(self, config_file_path: str = None):
         """
         初始化游戏设置
@@ -23,632 +239,442 @@ class GameSettings:
             config_file: 配置文件路径
         """
         self.config_file = Path(config_file_path) if config_file_path else config_file("config.ini")
-        self.config = configparser.ConfigParser()
+        # 读写时直接使用字符串路径，避免每次保存都经由 Path 转换
+        self._config_file_str = os.fspath(self.config_file)
+        self._config_dir = os.path.dirname(self._config_file_str)
+        self._tmp_file_str = self._config_file_str + '.tmp'
+        # 原始设置数据 {段: {键: 字符串}}，由 _parse_ini 读入、_format_ini 写出
+        self._data: Dict[str, Dict[str, str]] = {}
         
-        # 默认设置
-        self.default_settings = {
-            'Gameplay': {
-                'note_distance': '1600',      # 音符距离
-                'note_scale': '0.8',          # 音符缩放比例
-                'note_speed': '1.0',          # 音符速度倍数
-                'judge_line_position': '0.15', # 判定线位置比例
-                'note_area_scale': '1.0',     # 音符区整体比例
-                'hit_effect_scale': '0.6',    # 击中特效缩放比例
-                'judge_x_scale': '1.0',       # 判定线位置缩放比例
-                'chart_offset': '10',         # 谱面偏移(ms) 正数提前 负数延后
-                'target_fps': '60'            # 目标帧率 可选: 60 或 120
-            },
-            'State': {
-                'last_selected_song': '',
-                'last_selected_difficulty': 'Oni',
-                'auto_play': 'False'
-            },
-            'Audio': {
-                'master_volume': '1.0',       # 主音量
-                'sfx_volume': '1.0',          # 音效音量
-                'music_volume': '1.0'         # 音乐音量
-            },
-            'Display': {
-                'screen_width': '720',        # 屏幕宽度
-                'screen_height': '1280',      # 屏幕高度
-                'fullscreen': 'False'         # 全屏模式
-            },
-            'Graphics': {
-                'game_area_ratio': '0.20',
-                'judge_x_ratio': '0.15',
-                'drum_ratio': '0.48',
-                'drum_y_offset_ratio': '0.20',
-                'don_color': '230, 74, 25, 255',
-                'kat_color': '0, 162, 232, 255'
-            }
-        }
+        # 解析后的设置缓存 {"段.键": 已转换类型的值}，getter 只做一次字典查找
+        self._cache: Dict[str, Any] = {}
+        # 结合 note_area_scale 的缩放结果，只在基础设置变化时重新计算
+        self._scaled: Dict[str, Any] = {}
+        # 主循环每帧读取的目标帧率（已校验为60或120）
+        self._target_fps = 60
+        
+        # 延迟写盘：setter 只标记脏，由调用者在保存时（关闭设置、退出）调用 flush 写入
+        self._dirty = False
         
+        # 默认设置（模块级共享常量，修改前需复制）
+        self.default_settings = _DEFAULT_SETTINGS
+        
+        # 同步加载：各场景构造后立即读取设置，后台加载只会变成一次阻塞等待
         self._load_settings()
     
     def _load_settings(self):
         """加载设置"""
-        if self.config_file.exists():
+        if os.path.exists(self._config_file_str):
             try:
-                self.config.read(self.config_file, encoding='utf-8')
+                # 一次性读入整个文件再解析，减少系统调用
+                with self._open_for_read() as f:
+                    data = f.read()
+                self._data = _parse_ini(data)
                 print(f"Loaded game settings from {self.config_file}")
             except Exception as e:
                 print(f"Error loading settings: {e}")
-                self._create_default_config()
+                # 文件损坏，用默认设置覆盖
+                self._create_default_config(replace_existing=True)
         else:
             self._create_default_config()
+        
+        self._rebuild_cache()
+    
+    def _open_for_read(self):
+        """打开配置文件用于读取，在支持的平台上提示内核顺序预读（Linux/Android）"""
+        fd = os.open(self._config_file_str, os.O_RDONLY)
+        try:
+            if hasattr(os, 'posix_fadvise'):
+                try:
+                    os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_SEQUENTIAL)
+                except OSError:
+                    pass
+            return os.fdopen(fd, 'r', encoding='utf-8', buffering=65536)
+        except Exception:
+            os.close(fd)
+            raise
+    
+    def _rebuild_cache(self):
+        """把配置中的每一项一次性转换为对应类型并写入缓存"""
+        cache = dict(_DEFAULTS)
+        data = self._data
+        # 只查找已知设置项，其他模块的段（如 CategoryColors）不参与
+        for cache_key, section, key, converter in _FIELDS:
+            options = data.get(section)
+            if options is None:
+                continue
+            raw_value = options.get(key)
+            if raw_value is None:
+                continue
+            try:
+                cache[cache_key] = converter(raw_value)
+            except ValueError:
+                # 无法解析的值保留默认值
+                pass
+        # 屏幕尺寸由两个键组成，合并为一个元组缓存
+        cache['Display.size'] = (cache['Display.screen_width'], cache['Display.screen_height'])
+        self._cache = cache
+        self._target_fps = cache['Gameplay.target_fps']
+        self._recompute_scaled()
+    
+    def _recompute_scaled(self):
+        """根据基础设置重新计算所有缩放后的值"""
+        cache = self._cache
+        area_scale = cache['Gameplay.note_area_scale']
+        self._scaled = {
+            'scaled_note_distance': int(cache['Gameplay.note_distance'] * area_scale),
+            'scaled_note_scale': cache['Gameplay.note_scale'] * area_scale,
+            'scaled_judge_circle_scale': cache['Gameplay.judge_circle_scale'] * area_scale,
+            'scaled_hit_effect_scale': cache['Gameplay.hit_effect_scale'] * area_scale,
+            # 当note_area_scale缩小时，判定线位置应该向左移动（减小比例）
+            'scaled_judge_x_ratio': 0.15 * cache['Gameplay.judge_x_scale'] * area_scale,  # JUDGE_X_RATIO
+        }
     
-    def _create_default_config(self):
-        """创建默认配置文件"""
+    def _store_value(self, section: str, key: str, value):
+        """写入一项设置并同步更新缓存（不保存）"""
+        options = self._data.get(section)
+        if options is None:
+            # 段不存在时按默认设置补齐
+            options = self._data[section] = dict(self.default_settings.get(section, {}))
+        raw_value = str(value)
+        options[key] = raw_value
+        cache_key = f"{section}.{key}"
+        converter = _FIELD_TYPES.get(cache_key)
+        if converter is not None:
+            try:
+                self._cache[cache_key] = converter(raw_value)
+            except ValueError:
+                self._cache[cache_key] = _DEFAULTS[cache_key]
+            if cache_key in _SCALE_BASE_KEYS:
+                self._recompute_scaled()
+    
+    def _set_value(self, section: str, key: str, value):
+        """写入一项设置，同步更新缓存并保存"""
+        try:
+            self._store_value(section, key, value)
+            self._dirty = True
+        except Exception as e:
+            print(f"Error setting {section}.{key}: {e}")
+    
+    def _create_default_config(self, replace_existing: bool = False):
+        """
+        创建默认配置文件
+        
+        Args:
+            replace_existing: 文件已存在（但无法读取）时也用默认设置覆盖
+        """
         try:
             # 确保目录存在
-            self.config_file.parent.mkdir(parents=True, exist_ok=True)
+            if self._config_dir:
+                os.makedirs(self._config_dir, exist_ok=True)
             
-            # 写入默认设置
-            for section, options in self.default_settings.items():
-                self.config[section] = options
+            # 首次运行时 ConfigManager 可能刚刚创建了同一个文件，写入前再检查一次，
+            # 已存在则读入（缺少的设置项由 _DEFAULTS 补齐），不覆盖其中的其他段
+            if not replace_existing and os.path.exists(self._config_file_str):
+                with self._open_for_read() as f:
+                    self._data = _parse_ini(f.read())
+                return
             
-            with open(self.config_file, 'w', encoding='utf-8') as f:
-                self.config.write(f)
+            # 写入默认设置
+            self._data = copy.deepcopy(_DEFAULT_SETTINGS)
+            self._write_config()
             
             print(f"Created default config file: {self.config_file}")
         except Exception as e:
             print(f"Error creating config file: {e}")
     
-    def _ensure_gameplay_section(self):
-        """确保Gameplay段存在"""
-        if 'Gameplay' not in self.config:
-            self.config['Gameplay'] = self.default_settings['Gameplay']
-            self._save_settings()
-            print("Created Gameplay section in config")
+    def _write_config(self):
+        """把当前设置写入文件（先写临时文件再替换，避免写到一半时退出导致配置损坏）"""
+        with open(self._tmp_file_str, 'w', encoding='utf-8', newline='\n', buffering=65536) as f:
+            f.write(_format_ini(self._data))
+        os.replace(self._tmp_file_str, self._config_file_str)
     
     def get_note_distance(self) -> int:
         """获取音符距离"""
-        try:
-            # 首先尝试从Gameplay段获取
-            if 'Gameplay' in self.config:
-                return int(self.config.get('Gameplay', 'note_distance', fallback='1200'))
-            # 如果Gameplay段不存在，创建并返回默认值
-            else:
-                self._ensure_gameplay_section()
-                return 1200
-        except (ValueError, configparser.NoSectionError, configparser.NoOptionError):
-            return 1200
+        return self._cache['Gameplay.note_distance']
     
     def set_note_distance(self, distance: int):
         """设置音符距离"""
-        try:
-            if 'Gameplay' not in self.config:
-                self.config['Gameplay'] = {}
-            self.config['Gameplay']['note_distance'] = str(distance)
-            self._save_settings()
-        except Exception as e:
-            print(f"Error setting note distance: {e}")
+        self._set_value('Gameplay', 'note_distance', distance)
     
     def get_note_scale(self) -> float:
         """获取音符缩放比例"""
-        try:
-            if 'Gameplay' in self.config:
-                return float(self.config.get('Gameplay', 'note_scale', fallback='0.8'))
-            else:
-                self._ensure_gameplay_section()
-                return 0.8
-        except (ValueError, configparser.NoSectionError, configparser.NoOptionError):
-            return 0.8
+        return self._cache['Gameplay.note_scale']
     
     def set_note_scale(self, scale: float):
         """设置音符缩放比例"""
-        try:
-            if 'Gameplay' not in self.config:
-                self.config['Gameplay'] = {}
-            self.config['Gameplay']['note_scale'] = str(scale)
-            self._save_settings()
-        except Exception as e:
-            print(f"Error setting note scale: {e}")
+        self._set_value('Gameplay', 'note_scale', scale)
     
     def get_note_speed(self) -> float:
         """获取音符速度倍数"""
-        try:
-            return float(self.config.get('Gameplay', 'note_speed', fallback='1.0'))
-        except (ValueError, configparser.NoSectionError, configparser.NoOptionError):
-            return 1.0
+        return self._cache['Gameplay.note_speed']
     
     def set_note_speed(self, speed: float):
         """设置音符速度倍数"""
-        try:
-            if 'Gameplay' not in self.config:
-                self.config['Gameplay'] = {}
-            self.config['Gameplay']['note_speed'] = str(speed)
-            self._save_settings()
-        except Exception as e:
-            print(f"Error setting note speed: {e}")
+        self._set_value('Gameplay', 'note_speed', speed)
     
     def get_judge_line_position(self) -> float:
         """获取判定线位置比例"""
-        try:
-            return float(self.config.get('Gameplay', 'judge_line_position', fallback='0.15'))
-        except (ValueError, configparser.NoSectionError, configparser.NoOptionError):
-            return 0.15
+        return self._cache['Gameplay.judge_line_position']
     
     def set_judge_line_position(self, position: float):
         """设置判定线位置比例"""
-        try:
-            if 'Gameplay' not in self.config:
-                self.config['Gameplay'] = {}
-            self.config['Gameplay']['judge_line_position'] = str(position)
-            self._save_settings()
-        except Exception as e:
-            print(f"Error setting judge line position: {e}")
+        self._set_value('Gameplay', 'judge_line_position', position)
     
     def get_note_area_scale(self) -> float:
         """获取音符区整体比例"""
-        try:
-            if 'Gameplay' in self.config:
-                raw_value = self.config.get('Gameplay', 'note_area_scale', fallback='1.0')
-                # 移除注释部分（#后面的内容）
-                clean_value = raw_value.split('#')[0].strip()
-                return float(clean_value)
-            else:
-                self._ensure_gameplay_section()
-                return 1.0
-        except (ValueError, configparser.NoSectionError, configparser.NoOptionError):
-            return 1.0
+        return self._cache['Gameplay.note_area_scale']
     
     def set_note_area_scale(self, scale: float):
         """设置音符区整体比例"""
-        try:
-            if 'Gameplay' not in self.config:
-                self.config['Gameplay'] = {}
-            self.config['Gameplay']['note_area_scale'] = str(scale)
-            self._save_settings()
-        except Exception as e:
-            print(f"Error setting note area scale: {e}")
+        self._set_value('Gameplay', 'note_area_scale', scale)
     
     def get_scaled_note_distance(self) -> int:
         """获取缩放后的音符距离"""
-        base_distance = self.get_note_distance()
-        area_scale = self.get_note_area_scale()
-        return int(base_distance * area_scale)
+        return self._scaled['scaled_note_distance']
     
     def get_scaled_note_scale(self) -> float:
         """获取缩放后的音符比例"""
-        base_scale = self.get_note_scale()
-        area_scale = self.get_note_area_scale()
-        return base_scale * area_scale
+        return self._scaled['scaled_note_scale']
     
     def get_judge_circle_scale(self) -> float:
         """获取判定圈缩放比例"""
-        try:
-            if 'Gameplay' in self.config:
-                raw_value = self.config.get('Gameplay', 'judge_circle_scale', fallback='1.0')
-                # 移除注释部分（#后面的内容）
-                clean_value = raw_value.split('#')[0].strip()
-                return float(clean_value)
-            else:
-                self._ensure_gameplay_section()
-                return 1.0
-        except (ValueError, configparser.NoSectionError, configparser.NoOptionError):
-            return 1.0
+        return self._cache['Gameplay.judge_circle_scale']
     
     def set_judge_circle_scale(self, scale: float):
         """设置判定圈缩放比例"""
-        try:
-            if 'Gameplay' not in self.config:
-                self.config['Gameplay'] = {}
-            self.config['Gameplay']['judge_circle_scale'] = str(scale)
-            self._save_settings()
-        except Exception as e:
-            print(f"Error setting judge circle scale: {e}")
+        self._set_value('Gameplay', 'judge_circle_scale', scale)
     
     def get_scaled_judge_circle_scale(self) -> float:
         """获取缩放后的判定圈比例（结合note_area_scale）"""
-        base_scale = self.get_judge_circle_scale()
-        area_scale = self.get_note_area_scale()
-        return base_scale * area_scale
+        return self._scaled['scaled_judge_circle_scale']
     
     def get_hit_effect_scale(self) -> float:
         """获取击中特效缩放比例"""
-        try:
-            if 'Gameplay' in self.config:
-                raw_value = self.config.get('Gameplay', 'hit_effect_scale', fallback='0.6')
-                # 移除注释部分（#后面的内容）
-                clean_value = raw_value.split('#')[0].strip()
-                return float(clean_value)
-            else:
-                self._ensure_gameplay_section()
-                return 0.6
-        except (ValueError, configparser.NoSectionError, configparser.NoOptionError):
-            return 0.6
+        return self._cache['Gameplay.hit_effect_scale']
     
     def set_hit_effect_scale(self, scale: float):
         """设置击中特效缩放比例"""
-        try:
-            if 'Gameplay' not in self.config:
-                self.config['Gameplay'] = {}
-            self.config['Gameplay']['hit_effect_scale'] = str(scale)
-            self._save_settings()
-        except Exception as e:
-            print(f"Error setting hit effect scale: {e}")
+        self._set_value('Gameplay', 'hit_effect_scale', scale)
     
     def get_scaled_hit_effect_scale(self) -> float:
         """获取缩放后的击中特效比例（结合note_area_scale）"""
-        base_scale = self.get_hit_effect_scale()
-        area_scale = self.get_note_area_scale()
-        return base_scale * area_scale
+        return self._scaled['scaled_hit_effect_scale']
     
     def get_judge_x_scale(self) -> float:
         """获取判定线位置缩放比例"""
-        try:
-            if 'Gameplay' in self.config:
-                raw_value = self.config.get('Gameplay', 'judge_x_scale', fallback='1.0')
-                # 移除注释部分（#后面的内容）
-                clean_value = raw_value.split('#')[0].strip()
-                return float(clean_value)
-            else:
-                self._ensure_gameplay_section()
-                return 1.0
-        except (ValueError, configparser.NoSectionError, configparser.NoOptionError):
-            return 1.0
+        return self._cache['Gameplay.judge_x_scale']
     
     def set_judge_x_scale(self, scale: float):
         """设置判定线位置缩放比例"""
-        try:
-            if 'Gameplay' not in self.config:
-                self.config['Gameplay'] = {}
-            self.config['Gameplay']['judge_x_scale'] = str(scale)
-            self._save_settings()
-        except Exception as e:
-            print(f"Error setting judge x scale: {e}")
+        self._set_value('Gameplay', 'judge_x_scale', scale)
     
     def get_scaled_judge_x_ratio(self) -> float:
         """获取缩放后的判定线位置比例（结合note_area_scale）"""
-        base_ratio = 0.15  # JUDGE_X_RATIO
-        scale = self.get_judge_x_scale()
-        area_scale = self.get_note_area_scale()
-        # 当note_area_scale缩小时，判定线位置应该向左移动（减小比例）
-        return base_ratio * scale * area_scale
+        return self._scaled['scaled_judge_x_ratio']
     
     def get_master_volume(self) -> float:
         """获取主音量"""
-        try:
-            return float(self.config.get('Audio', 'master_volume', fallback='1.0'))
-        except (ValueError, configparser.NoSectionError, configparser.NoOptionError):
-            return 1.0
+        return self._cache['Audio.master_volume']
     
     def set_master_volume(self, volume: float):
         """设置主音量"""
-        try:
-            if 'Audio' not in self.config:
-                self.config['Audio'] = {}
-            self.config['Audio']['master_volume'] = str(volume)
-            self._save_settings()
-        except Exception as e:
-            print(f"Error setting master volume: {e}")
+        self._set_value('Audio', 'master_volume', volume)
     
     def get_screen_size(self) -> tuple:
         """获取屏幕尺寸"""
-        try:
-            width = int(self.config.get('Display', 'screen_width', fallback='720'))
-            height = int(self.config.get('Display', 'screen_height', fallback='1280'))
-            return (width, height)
-        except (ValueError, configparser.NoSectionError, configparser.NoOptionError):
-            return (720, 1280)
+        return self._cache['Display.size']
     
     def set_screen_size(self, width: int, height: int):
         """设置屏幕尺寸"""
         try:
-            if 'Display' not in self.config:
-                self.config['Display'] = {}
-            self.config['Display']['screen_width'] = str(width)
-            self.config['Display']['screen_height'] = str(height)
-            self._save_settings()
+            self._store_value('Display', 'screen_width', width)
+            self._store_value('Display', 'screen_height', height)
+            cache = self._cache
+            cache['Display.size'] = (cache['Display.screen_width'], cache['Display.screen_height'])
+            self._dirty = True
         except Exception as e:
             print(f"Error setting screen size: {e}")
     
     def get_fullscreen(self) -> bool:
         """获取全屏模式"""
-        try:
-            return self.config.getboolean('Display', 'fullscreen', fallback=False)
-        except (ValueError, configparser.NoSectionError, configparser.NoOptionError):
-            return False
+        return self._cache['Display.fullscreen']
     
     def set_fullscreen(self, fullscreen: bool):
         """设置全屏模式"""
-        try:
-            if 'Display' not in self.config:
-                self.config['Display'] = {}
-            self.config['Display']['fullscreen'] = str(fullscreen)
-            self._save_settings()
-        except Exception as e:
-            print(f"Error setting fullscreen: {e}")
+        self._set_value('Display', 'fullscreen', fullscreen)
     
     # --- Graphics Settings ---
 
-    def _get_color(self, key: str, fallback: str) -> tuple:
-        """Helper to get a color from config."""
-        color_str = self.config.get('Graphics', key, fallback=fallback)
-        try:
-            r, g, b, a = [int(c.strip()) for c in color_str.split(',')]
-            return r / 255.0, g / 255.0, b / 255.0, a / 255.0
-        except ValueError:
-            r, g, b = [int(c.strip()) for c in fallback.split(',')[:3]]
-            return r / 255.0, g / 255.0, b / 255.0, 1.0
-
     def get_don_color(self) -> tuple:
         """获取'咚'音符的颜色"""
-        return self._get_color('don_color', '230, 74, 25, 255')
+        return self._cache['Graphics.don_color']
 
     def get_kat_color(self) -> tuple:
         """获取'咔'音符的颜色"""
-        return self._get_color('kat_color', '0, 162, 232, 255')
+        return self._cache['Graphics.kat_color']
+
+    def set_don_color(self, color: tuple):
+        """设置'咚'音符的颜色 (r, g, b[, a])，各分量 0~255"""
+        self._set_value('Graphics', 'don_color', self._format_color(color))
+
+    def set_kat_color(self, color: tuple):
+        """设置'咔'音符的颜色 (r, g, b[, a])，各分量 0~255"""
+        self._set_value('Graphics', 'kat_color', self._format_color(color))
+
+    @staticmethod
+    def _format_color(color: tuple) -> str:
+        """把 0~255 的颜色转换为配置文件中的 "r, g, b, a" 格式"""
+        if len(color) == 3:
+            color = (*color, 255)
+        return ', '.join(str(int(c)) for c in color)
 
     def get_game_area_ratio(self) -> float:
         """获取游戏区域高度比例"""
-        return self.config.getfloat('Graphics', 'game_area_ratio', fallback=0.20)
+        return self._cache['Graphics.game_area_ratio']
 
     def get_judge_x_ratio(self) -> float:
         """获取判定线位置比例"""
-        return self.config.getfloat('Graphics', 'judge_x_ratio', fallback=0.15)
+        return self._cache['Graphics.judge_x_ratio']
         
     # --- State Settings ---
 
     def get_last_selected_song(self) -> str:
         """获取上次选择的歌曲路径"""
-        return self.config.get('State', 'last_selected_song', fallback='')
+        return self._cache['State.last_selected_song']
 
     def set_last_selected_song(self, song_path: str):
         """设置上次选择的歌曲路径"""
-        if 'State' not in self.config:
-            self.config['State'] = {}
-        self.config.set('State', 'last_selected_song', song_path)
-        self._save_settings()
+        self._set_value('State', 'last_selected_song', song_path)
 
     def get_last_selected_difficulty(self) -> str:
         """获取上次选择的难度"""
-        return self.config.get('State', 'last_selected_difficulty', fallback='Oni')
+        return self._cache['State.last_selected_difficulty']
 
     def set_last_selected_difficulty(self, difficulty: str):
         """设置上次选择的难度"""
-        if 'State' not in self.config:
-            self.config['State'] = {}
-        self.config.set('State', 'last_selected_difficulty', difficulty)
-        self._save_settings()
+        self._set_value('State', 'last_selected_difficulty', difficulty)
 
     def get_auto_play(self) -> bool:
         """获取自动演奏设置"""
-        return self.config.getboolean('State', 'auto_play', fallback=False)
+        return self._cache['State.auto_play']
 
     def set_auto_play(self, auto_play: bool):
         """设置自动演奏"""
-        if 'State' not in self.config:
-            self.config['State'] = {}
-        self.config.set('State', 'auto_play', str(auto_play))
-        self._save_settings()
+        self._set_value('State', 'auto_play', auto_play)
     
-    def _save_settings(self):
-        """保存设置到文件"""
+    def flush(self):
+        """把未保存的修改写入文件（关闭设置界面、退出时调用）"""
+        if not self._dirty:
+            return
         try:
-            with open(self.config_file, 'w', encoding='utf-8') as f:
-                self.config.write(f)
+            self._write_config()
+            self._dirty = False
         except Exception as e:
             print(f"Error saving settings: {e}")
     
     def reset_to_defaults(self):
         """重置为默认设置"""
-        self.config.clear()
-        for section, options in self.default_settings.items():
-            self.config[section] = options
-        self._save_settings()
+        self._data = copy.deepcopy(_DEFAULT_SETTINGS)
+        self._rebuild_cache()
+        self._dirty = True
+        self.flush()
         print("Settings reset to defaults")
     
     def get_all_settings(self) -> Dict[str, Any]:
         """获取所有设置"""
-        settings = {}
-        for section in self.config.sections():
-            settings[section] = dict(self.config[section])
-        return settings
+        return {section: options.copy() for section, options in self._data.items()}
     
     def print_current_settings(self):
         """打印当前设置"""
         print("\n=== Current Game Settings ===")
-        for section in self.config.sections():
+        for section, options in self._data.items():
             print(f"\n[{section}]")
-            for key, value in self.config[section].items():
+            for key, value in options.items():
                 try:
                     print(f"  {key} = {value}")
                 except UnicodeEncodeError:
                     # 处理编码问题
                     safe_value = str(value).encode('ascii', errors='replace').decode('ascii')
                     print(f"  {key} = {safe_value}")
-        print("=" * 30)
+        print(_BANNER)
     
     # ========== GameSettings Section ==========
     def get_default_speed(self) -> float:
         """获取默认速度"""
-        try:
-            if 'GameSettings' in self.config:
-                return float(self.config.get('GameSettings', 'default_speed', fallback='1.0'))
-            return 1.0
-        except (ValueError, configparser.NoSectionError, configparser.NoOptionError):
-            return 1.0
+        return self._cache['GameSettings.default_speed']
     
     def set_default_speed(self, speed: float):
         """设置默认速度"""
-        try:
-            if 'GameSettings' not in self.config:
-                self.config['GameSettings'] = {}
-            self.config['GameSettings']['default_speed'] = str(speed)
-            self._save_settings()
-        except Exception as e:
-            print(f"Error setting default speed: {e}")
+        self._set_value('GameSettings', 'default_speed', speed)
     
     def get_default_difficulty(self) -> str:
         """获取默认难度"""
-        try:
-            if 'GameSettings' in self.config:
-                return self.config.get('GameSettings', 'default_difficulty', fallback='Oni')
-            return 'Oni'
-        except (configparser.NoSectionError, configparser.NoOptionError):
-            return 'Oni'
+        return self._cache['GameSettings.default_difficulty']
     
     def set_default_difficulty(self, difficulty: str):
         """设置默认难度"""
-        try:
-            if 'GameSettings' not in self.config:
-                self.config['GameSettings'] = {}
-            self.config['GameSettings']['default_difficulty'] = difficulty
-            self._save_settings()
-        except Exception as e:
-            print(f"Error setting default difficulty: {e}")
+        self._set_value('GameSettings', 'default_difficulty', difficulty)
     
     # ========== DisplaySettings Section ==========
     def get_title_font_size(self) -> int:
         """获取标题字体大小"""
-        try:
-            if 'DisplaySettings' in self.config:
-                return int(self.config.get('DisplaySettings', 'title_font_size', fallback='46'))
-            return 46
-        except (ValueError, configparser.NoSectionError, configparser.NoOptionError):
-            return 46
+        return self._cache['DisplaySettings.title_font_size']
     
     def set_title_font_size(self, size: int):
         """设置标题字体大小"""
-        try:
-            if 'DisplaySettings' not in self.config:
-                self.config['DisplaySettings'] = {}
-            self.config['DisplaySettings']['title_font_size'] = str(size)
-            self._save_settings()
-        except Exception as e:
-            print(f"Error setting title font size: {e}")
+        self._set_value('DisplaySettings', 'title_font_size', size)
     
     def get_category_font_size(self) -> int:
         """获取分类字体大小"""
-        try:
-            if 'DisplaySettings' in self.config:
-                return int(self.config.get('DisplaySettings', 'category_font_size', fallback='20'))
-            return 20
-        except (ValueError, configparser.NoSectionError, configparser.NoOptionError):
-            return 20
+        return self._cache['DisplaySettings.category_font_size']
     
     def set_category_font_size(self, size: int):
         """设置分类字体大小"""
-        try:
-            if 'DisplaySettings' not in self.config:
-                self.config['DisplaySettings'] = {}
-            self.config['DisplaySettings']['category_font_size'] = str(size)
-            self._save_settings()
-        except Exception as e:
-            print(f"Error setting category font size: {e}")
+        self._set_value('DisplaySettings', 'category_font_size', size)
     
     def get_title_outline(self) -> int:
         """获取标题描边大小"""
-        try:
-            if 'DisplaySettings' in self.config:
-                return int(self.config.get('DisplaySettings', 'title_outline', fallback='3'))
-            return 3
-        except (ValueError, configparser.NoSectionError, configparser.NoOptionError):
-            return 3
+        return self._cache['DisplaySettings.title_outline']
     
     def set_title_outline(self, size: int):
         """设置标题描边大小"""
-        try:
-            if 'DisplaySettings' not in self.config:
-                self.config['DisplaySettings'] = {}
-            self.config['DisplaySettings']['title_outline'] = str(size)
-            self._save_settings()
-        except Exception as e:
-            print(f"Error setting title outline: {e}")
+        self._set_value('DisplaySettings', 'title_outline', size)
     
     def get_category_outline(self) -> int:
         """获取分类描边大小"""
-        try:
-            if 'DisplaySettings' in self.config:
-                return int(self.config.get('DisplaySettings', 'category_outline', fallback='2'))
-            return 2
-        except (ValueError, configparser.NoSectionError, configparser.NoOptionError):
-            return 2
+        return self._cache['DisplaySettings.category_outline']
     
     def set_category_outline(self, size: int):
         """设置分类描边大小"""
-        try:
-            if 'DisplaySettings' not in self.config:
-                self.config['DisplaySettings'] = {}
-            self.config['DisplaySettings']['category_outline'] = str(size)
-            self._save_settings()
-        except Exception as e:
-            print(f"Error setting category outline: {e}")
+        self._set_value('DisplaySettings', 'category_outline', size)
     
     def get_chart_offset(self) -> float:
         """获取谱面偏移(ms) 正数提前 负数延后"""
-        try:
-            if 'Gameplay' in self.config:
-                raw_value = self.config.get('Gameplay', 'chart_offset', fallback='10')
-                # 移除注释部分（#后面的内容）
-                clean_value = raw_value.split('#')[0].strip()
-                return float(clean_value)
-            else:
-                self._ensure_gameplay_section()
-                return 10.0
-        except (ValueError, configparser.NoSectionError, configparser.NoOptionError):
-            return 10.0
+        return self._cache['Gameplay.chart_offset']
     
     def set_chart_offset(self, offset: float):
         """设置谱面偏移(ms) 正数提前 负数延后"""
-        try:
-            if 'Gameplay' not in self.config:
-                self.config['Gameplay'] = {}
-            self.config['Gameplay']['chart_offset'] = str(offset)
-            self._save_settings()
-        except Exception as e:
-            print(f"Error setting chart offset: {e}")
+        self._set_value('Gameplay', 'chart_offset', offset)
     
     def get_target_fps(self) -> int:
         """获取目标帧率 (60 或 120)"""
-        try:
-            if 'Gameplay' in self.config:
-                raw_value = self.config.get('Gameplay', 'target_fps', fallback='60')
-                # 移除注释部分（#后面的内容）
-                clean_value = raw_value.split('#')[0].strip()
-                fps = int(clean_value)
-                # 只允许60或120
-                if fps in [60, 120]:
-                    return fps
-                return 60
-            else:
-                self._ensure_gameplay_section()
-                return 60
-        except (ValueError, configparser.NoSectionError, configparser.NoOptionError):
-            return 60
+        return self._target_fps
     
     def set_target_fps(self, fps: int):
         """设置目标帧率 (60 或 120)"""
-        try:
-            if 'Gameplay' not in self.config:
-                self.config['Gameplay'] = {}
-            # 确保只能设置60或120
-            if fps in [60, 120]:
-                self.config['Gameplay']['target_fps'] = str(fps)
-                self._save_settings()
-            else:
-                print(f"Invalid FPS value: {fps}. Only 60 or 120 are allowed.")
-        except Exception as e:
-            print(f"Error setting target FPS: {e}")
+        # 确保只能设置60或120
+        if fps in (60, 120):
+            self._set_value('Gameplay', 'target_fps', fps)
+            self._target_fps = self._cache['Gameplay.target_fps']
+        else:
+            print(f"Invalid FPS value: {fps}. Only 60 or 120 are allowed.")
     
     # ========== LastSelected Section ==========
     def get_last_selected_category(self) -> str:
         """获取上次选择的分类"""
-        try:
-            if 'LastSelected' in self.config:
-                return self.config.get('LastSelected', 'category', fallback='')
-            return ''
-        except (configparser.NoSectionError, configparser.NoOptionError):
-            return ''
+        return self._cache['LastSelected.category']
     
     def set_last_selected_category(self, category: str):
         """设置上次选择的分类"""
-        try:
-            if 'LastSelected' not in self.config:
-                self.config['LastSelected'] = {}
-            self.config['LastSelected']['category'] = category
-            self._save_settings()
-        except Exception as e:
-            print(f"Error setting last selected category: {e}")
+        self._set_value('LastSelected', 'category', category)
@@ -5,11 +5,19 @@ LRC Lyrics Parser Module
 负责解析 LRC 格式的歌词文件
 """
 
+import bisect
 import re
+from operator import itemgetter
 from pathlib import Path
 from typing import List, Tuple, Optional
 
 
+# 元数据标签 [ti:标题]，key 必须是字母（不匹配时间戳）
+_META_RE = re.compile(r'\[([a-zA-Z]+):(.+)\]')
+# 时间戳 [00:12.00] [00:12.000] [00:12]
+_TIME_RE = re.compile(r'\[(\d+):(\d+)(?:\.(\d+))?\]')
+
+
 class LRCParser:
     """
     LRC 歌词解析器
@@ -27,8 +35,14 @@ class LRCParser:
             lrc_path: LRC 文件路径
         """
         self.lrc_path = lrc_path
-        self.lyrics: List[Tuple[float, str]] = []  # (时间戳(毫秒), 歌词文本)
+        self.lyrics: List[Tuple[int, str]] = []  # (时间戳(整数毫秒), 歌词文本)
         self.metadata = {}  # 元数据（标题、艺术家等）
+        # 排序后的时间戳与歌词文本（并行数组），供二分查找使用
+        self._timestamps: List[int] = []
+        self._texts: List[str] = []
+        # 上次查询的位置与时间：游戏时间单调递增，通常只需向前移动0~1句
+        self._last_index = -1
+        self._last_time = float('-inf')
         
         if lrc_path.exists():
             self._parse_lrc()
@@ -45,41 +59,60 @@ class LRCParser:
         [00:17.20]第二句歌词
         """
         try:
+            # 一次性读入整个文件，再按行拆分
             with open(self.lrc_path, 'r', encoding='utf-8') as f:
-                for line in f:
-                    line = line.strip()
-                    if not line:
-                        continue
-                    
-                    # 解析元数据标签 [ti:标题] [ar:艺术家] 等（不匹配时间戳）
-                    # 元数据标签的key必须是字母开头，不能是数字
-                    metadata_match = re.match(r'\[([a-zA-Z]+):(.+)\]', line)
-                    if metadata_match:
-                        key, value = metadata_match.groups()
-                        self.metadata[key.lower()] = value.strip()
-                        continue
+                data = f.read()
+            
+            for line in data.splitlines():
+                line = line.strip()
+                if not line:
+                    continue
+                
+                # 解析元数据标签 [ti:标题] [ar:艺术家] 等（不匹配时间戳）
+                # 元数据标签的key必须是字母开头，不能是数字
+                metadata_match = _META_RE.match(line)
+                if metadata_match:
+                    key, value = metadata_match.groups()
+                    self.metadata[key.lower()] = value.strip()
+                    continue
+                
+                # 解析时间戳和歌词 [00:12.00]歌词文本
+                # 支持多种格式：[00:12.00] [00:12.000] [00:12]
+                # 只扫描一遍：时间戳与歌词文本都从同一组匹配结果中取得
+                time_matches = list(_TIME_RE.finditer(line))
+                if time_matches:
+                    # 提取歌词文本（去掉所有时间戳）
+                    # 时间戳通常都在行首，直接从最后一个时间戳之后截取
+                    text_start = time_matches[-1].end()
+                    if text_start == sum(m.end() - m.start() for m in time_matches):
+                        lyric_text = line[text_start:].strip()
+                    else:
+                        # 时间戳夹在歌词中间：拼接时间戳之间的片段
+                        pieces = []
+                        position = 0
+                        for match in time_matches:
+                            pieces.append(line[position:match.start()])
+                            position = match.end()
+                        pieces.append(line[position:])
+                        lyric_text = ''.join(pieces).strip()
                     
-                    # 解析时间戳和歌词 [00:12.00]歌词文本
-                    # 支持多种格式：[00:12.00] [00:12.000] [00:12]
-                    time_matches = re.findall(r'\[(\d+):(\d+)(?:\.(\d+))?\]', line)
-                    if time_matches:
-                        # 提取歌词文本（去掉所有时间戳）
-                        lyric_text = re.sub(r'\[\d+:\d+(?:\.\d+)?\]', '', line).strip()
-                        
-                        if lyric_text:  # 只添加非空歌词
-                            # 一行可能有多个时间戳（同一歌词在不同时间显示）
-                            for match in time_matches:
-                                minutes = int(match[0])
-                                seconds = int(match[1])
-                                # 毫秒部分可能不存在，默认为0
-                                centiseconds = int(match[2]) if match[2] else 0
-                                
-                                # 转换为毫秒
-                                timestamp_ms = (minutes * 60 + seconds) * 1000 + centiseconds * 10
-                                self.lyrics.append((timestamp_ms, lyric_text))
+                    if lyric_text:  # 只添加非空歌词
+                        # 一行可能有多个时间戳（同一歌词在不同时间显示）
+                        for match in time_matches:
+                            minutes, seconds, centiseconds = match.groups()
+                            minutes = int(minutes)
+                            seconds = int(seconds)
+                            # 毫秒部分可能不存在，默认为0
+                            centiseconds = int(centiseconds) if centiseconds else 0
+                            
+                            # 转换为毫秒
+                            timestamp_ms = (minutes * 60 + seconds) * 1000 + centiseconds * 10
+                            self.lyrics.append((timestamp_ms, lyric_text))
             
-            # 按时间戳排序
-            self.lyrics.sort(key=lambda x: x[0])
+            # 按时间戳排序（稳定排序，时间戳相同的歌词保持文件中的顺序）
+            self.lyrics.sort(key=itemgetter(0))
+            self._timestamps = [timestamp for timestamp, _ in self.lyrics]
+            self._texts = [text for _, text in self.lyrics]
             
             if self.lyrics:
                 print(f"[LRC] Successfully parsed {len(self.lyrics)} lyric lines")
@@ -87,7 +120,7 @@ class LRCParser:
         except Exception as e:
             print(f"[LRC] Failed to parse file {self.lrc_path}: {e}")
     
-    def get_lyric_at_time(self, current_time_ms: float) -> Optional[str]:
+    def get_lyric_at_time(self, current_time_ms: int) -> Optional[str]:
         """
         获取指定时间的歌词
         Get lyric at specified time
@@ -98,20 +131,22 @@ class LRCParser:
         Returns:
             Optional[str]: 当前应该显示的歌词文本，如果没有则返回 None
         """
-        if not self.lyrics:
-            return None
-        
-        # 找到当前时间之前最近的一句歌词
-        current_lyric = None
-        for timestamp, text in self.lyrics:
-            if timestamp <= current_time_ms:
-                current_lyric = text
-            else:
-                break
+        # 找到当前时间之前最近的一句歌词（时间戳相同时取最后一句）
+        timestamps = self._timestamps
+        if current_time_ms < self._last_time:
+            # 时间回退（重新开始、跳转），重新二分查找
+            index = bisect.bisect_right(timestamps, current_time_ms) - 1
+        else:
+            index = self._last_index
+            count = len(timestamps)
+            while index + 1 < count and timestamps[index + 1] <= current_time_ms:
+                index += 1
         
-        return current_lyric
+        self._last_index = index
+        self._last_time = current_time_ms
+        return self._texts[index] if index >= 0 else None
     
-    def get_next_lyric_time(self, current_time_ms: float) -> Optional[float]:
+    def get_next_lyric_time(self, current_time_ms: int) -> Optional[int]:
         """
         获取下一句歌词的时间戳
         Get next lyric timestamp
@@ -120,12 +155,10 @@ class LRCParser:
             current_time_ms: 当前时间（毫秒）
         
         Returns:
-            Optional[float]: 下一句歌词的时间戳（毫秒），如果没有则返回 None
+            Optional[int]: 下一句歌词的时间戳（毫秒），如果没有则返回 None
         """
-        for timestamp, text in self.lyrics:
-            if timestamp > current_time_ms:
-                return timestamp
-        return None
+        index = bisect.bisect_right(self._timestamps, current_time_ms)
+        return self._timestamps[index] if index < len(self._timestamps) else None
     
     def has_lyrics(self) -> bool:
         """
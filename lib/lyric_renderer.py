@@ -6,10 +6,40 @@ Lyric Renderer Module
 """
 
 import pygame
-from typing import Optional
+from collections import OrderedDict
+from typing import Iterable, Optional
 from pathlib import Path
 
 
+# 切换动画查找表的分段数（120ms 动画每段约 3.75ms，远小于一帧）
+LYRIC_ANIM_STEPS = 32
+
+
+def _build_lyric_anim_table(steps: int) -> list:
+    """
+    预计算歌词切换动画每个进度段的参数
+    
+    每项为 (旧歌词透明度, 旧歌词位移系数, 新歌词透明度, 新歌词位移系数, 新歌词位移常量)，
+    位移 = int(移动距离 * 系数 + 常量)，移动距离取决于歌词高度，在绘制时代入
+    """
+    table = []
+    for i in range(steps + 1):
+        progress = i / steps  # 0.0 到 1.0
+        old_alpha = int(255 * (1.0 - progress))  # 255 → 0
+        new_alpha = int(255 * (0.5 + 0.5 * progress))  # 127 → 255
+        # 新歌词带过冲效果（先超过中心10px，再回弹）
+        if progress < 0.7:
+            # 前70%时间：从下方快速滑到中心偏上10px
+            t = progress / 0.7
+            new_factor, new_const = 1.0 - t, -10 * t
+        else:
+            # 后30%时间：从偏上10px回弹到中心
+            t = (progress - 0.7) / 0.3
+            new_factor, new_const = 0.0, -10 * (1.0 - t)
+        table.append((old_alpha, -progress, new_alpha, new_factor, new_const))
+    return table
+
+
 class LyricRenderer:
     """
     歌词渲染器
@@ -54,6 +84,14 @@ class LyricRenderer:
         self.text_color = (255, 255, 255)  # 白色文字
         self.outline_color = (76, 95, 132)  # #4c5f84 描边色
         self.outline_width = 3  # 描边宽度
+        # 描边偏移（outline_width 为半径的方形区域，去掉中心），相对描边表面左上角
+        w = self.outline_width
+        self._outline_offsets = [
+            (w + dx, w + dy)
+            for dx in range(-w, w + 1)
+            for dy in range(-w, w + 1)
+            if dx != 0 or dy != 0
+        ]
         
         # 动画状态
         self.current_lyric = ""  # 当前显示的歌词
@@ -62,6 +100,49 @@ class LyricRenderer:
         self.animation_start_time = 0  # 动画开始时间（毫秒）
         self.animation_duration = 120  # 动画持续时间（毫秒）- 快速版本
         self.is_animating = False  # 是否正在动画
+        self._anim_table = _build_lyric_anim_table(LYRIC_ANIM_STEPS)
+        
+        # 已渲染歌词表面缓存（LRU），副歌等重复歌词无需重新渲染
+        self._surface_cache = OrderedDict()
+        self.max_surface_cache_size = 128
+    
+    def _get_lyric_surface(self, lyric_text: str) -> pygame.Surface:
+        """
+        获取歌词表面（带缓存）
+        Get lyric surface, rendering it only on cache miss
+        
+        Args:
+            lyric_text: 歌词文本
+            
+        Returns:
+            pygame.Surface: 渲染好的歌词表面（共享对象，只允许修改其整体透明度）
+        """
+        surface = self._surface_cache.get(lyric_text)
+        if surface is not None:
+            self._surface_cache.move_to_end(lyric_text)
+            # 清除上次动画残留的整体透明度
+            surface.set_alpha(None)
+            return surface
+        
+        surface = self._render_lyric_surface(lyric_text)
+        self._surface_cache[lyric_text] = surface
+        if len(self._surface_cache) > self.max_surface_cache_size:
+            self._surface_cache.popitem(last=False)
+        return surface
+    
+    def prerender(self, lyric_texts: Iterable[str]):
+        """
+        在歌曲开始前预渲染歌词（填充表面缓存）
+        Pre-render lyrics into the surface cache before gameplay starts
+        
+        游戏中切换歌词时直接命中缓存，渲染开销不会落在某一帧上
+        
+        Args:
+            lyric_texts: 歌曲中的歌词文本（可重复，按出现顺序）
+        """
+        unique_texts = [text for text in dict.fromkeys(lyric_texts) if text]
+        for text in unique_texts[:self.max_surface_cache_size]:
+            self._get_lyric_surface(text)
     
     def _render_lyric_surface(self, lyric_text: str) -> pygame.Surface:
         """
@@ -84,15 +165,12 @@ class LyricRenderer:
             pygame.SRCALPHA
         )
         
-        # 8个方向绘制描边
-        for dx in range(-self.outline_width, self.outline_width + 1):
-            for dy in range(-self.outline_width, self.outline_width + 1):
-                if dx != 0 or dy != 0:
-                    outline_text = self.font.render(lyric_text, True, self.outline_color)
-                    outline_surface.blit(
-                        outline_text,
-                        (self.outline_width + dx, self.outline_width + dy)
-                    )
+        # 描边文字只渲染一次，再在各偏移处批量绘制
+        outline_text = self.font.render(lyric_text, True, self.outline_color)
+        outline_surface.blits(
+            [(outline_text, offset) for offset in self._outline_offsets],
+            doreturn=False
+        )
         
         # 在描边上绘制主文字
         outline_surface.blit(text_surface, (self.outline_width, self.outline_width))
@@ -119,14 +197,14 @@ class LyricRenderer:
         if lyric_text != self.current_lyric:
             # 如果有旧歌词，启动切换动画
             if self.current_lyric:
-                self.old_lyric_surface = self._render_lyric_surface(self.current_lyric)
+                self.old_lyric_surface = self._get_lyric_surface(self.current_lyric)
                 self.is_animating = True
                 self.animation_start_time = current_time
             
             # 准备新歌词
             self.current_lyric = lyric_text if lyric_text else ""
             if self.current_lyric:
-                self.new_lyric_surface = self._render_lyric_surface(self.current_lyric)
+                self.new_lyric_surface = self._get_lyric_surface(self.current_lyric)
             else:
                 self.new_lyric_surface = None
         
@@ -137,54 +215,42 @@ class LyricRenderer:
         # 如果正在动画中
         if self.is_animating:
             elapsed = current_time - self.animation_start_time
-            progress = min(1.0, elapsed / self.animation_duration)  # 0.0 到 1.0
+            step = min(LYRIC_ANIM_STEPS, elapsed * LYRIC_ANIM_STEPS // self.animation_duration)
+            old_alpha, old_factor, new_alpha, new_factor, new_const = self._anim_table[step]
             
             # 绘制旧歌词（向上淡出）
             if self.old_lyric_surface:
-                old_alpha = int(255 * (1.0 - progress))  # 255 → 0
                 # 计算移动距离：歌词高度的125%（减少50%）
                 lyric_height = self.old_lyric_surface.get_height()
                 move_distance = int(lyric_height * 1.25)
-                old_offset_y = -int(move_distance * progress)  # 向上移动
+                old_offset_y = int(move_distance * old_factor)  # 向上移动
                 old_y = self.lyric_y + old_offset_y
                 old_x = (self.screen_width - self.old_lyric_surface.get_width()) // 2
                 
-                # 应用透明度
-                old_surface_copy = self.old_lyric_surface.copy()
-                old_surface_copy.set_alpha(old_alpha)
-                self.screen.blit(old_surface_copy, (old_x, old_y))
+                # 直接设置整体透明度，无需复制表面
+                self.old_lyric_surface.set_alpha(old_alpha)
+                self.screen.blit(self.old_lyric_surface, (old_x, old_y))
             
             # 绘制新歌词（从下方快速滑入，带过冲回弹效果）
             if self.new_lyric_surface:
-                # 透明度：50% → 100%
-                new_alpha = int(255 * (0.5 + 0.5 * progress))  # 127 → 255
-                
                 # 计算移动距离：歌词高度的125%（减少50%）
                 lyric_height = self.new_lyric_surface.get_height()
                 move_distance = int(lyric_height * 1.25)
-                
-                # 位置计算：带过冲效果（先超过中心10px，再回弹）
-                if progress < 0.7:
-                    # 前70%时间：从下方快速滑到中心偏上10px
-                    t = progress / 0.7
-                    new_offset_y = int(move_distance * (1.0 - t) - 10 * t)  # 从下方 → 中心-10px
-                else:
-                    # 后30%时间：从偏上10px回弹到中心
-                    t = (progress - 0.7) / 0.3
-                    new_offset_y = int(-10 * (1.0 - t))  # -10 → 0
+                new_offset_y = int(move_distance * new_factor + new_const)
                 
                 new_y = self.lyric_y + new_offset_y
                 new_x = (self.screen_width - self.new_lyric_surface.get_width()) // 2
                 
-                # 应用透明度
-                new_surface_copy = self.new_lyric_surface.copy()
-                new_surface_copy.set_alpha(new_alpha)
-                self.screen.blit(new_surface_copy, (new_x, new_y))
+                # 直接设置整体透明度，无需复制表面
+                self.new_lyric_surface.set_alpha(new_alpha)
+                self.screen.blit(self.new_lyric_surface, (new_x, new_y))
             
             # 动画结束
-            if progress >= 1.0:
+            if step >= LYRIC_ANIM_STEPS:
                 self.is_animating = False
                 self.old_lyric_surface = None
+                if self.new_lyric_surface:
+                    self.new_lyric_surface.set_alpha(None)
         else:
             # 没有动画，直接绘制当前歌词
             if self.new_lyric_surface:
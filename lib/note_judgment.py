@@ -31,6 +31,13 @@ class NoteJudgment:
     - 分数和连段计算
     """
     
+    # 每帧都会访问这些属性，使用固定槽位（game.py 也会直接重置其中几个）
+    __slots__ = (
+        'active_drumroll', 'last_drumroll_hit_time',
+        'current_judgment', 'judgment_time', 'is_super_large_note',
+        'base_note_score',
+    )
+    
     def __init__(self, base_note_score=100):
         """
         初始化判定系统
@@ -90,9 +97,8 @@ class NoteJudgment:
         if self.active_drumroll:
             return self._handle_drumroll_hit(is_don, game_time, sound_don, sound_kat, balloon_count)
         
-        # 计算时间差
-        note_time = note.hit_ms if hasattr(note, 'hit_ms') else note.time_ms
-        timing_diff = abs(game_time - note_time)
+        # 计算时间差（解析器为每个音符都设置了 hit_ms）
+        timing_diff = abs(game_time - note.hit_ms)
         
         # 超出判定窗口
         if timing_diff > OK_WINDOW:
@@ -131,7 +137,7 @@ class NoteJudgment:
         result['advance_index'] = True
         self.current_judgment = result['judgment']
         self.judgment_time = game_time
-        self.is_super_large_note = getattr(note, 'is_super_large', False)  # 记录是否是超大音符
+        self.is_super_large_note = note.is_super_large  # 记录是否是超大音符
         
         return result
     
@@ -206,12 +212,10 @@ class NoteJudgment:
             return False
         
         # 音符已过判定区且未击打
-        note_time = note.hit_ms if hasattr(note, 'hit_ms') else note.time_ms
-        
-        if game_time > note_time + OK_WINDOW and note.type != -1:
+        if game_time > note.hit_ms + OK_WINDOW and note.type != -1:
             self.current_judgment = "Miss"
             self.judgment_time = game_time
-            self.is_super_large_note = getattr(note, 'is_super_large', False)  # Miss时也记录是否超大音符
+            self.is_super_large_note = note.is_super_large  # Miss时也记录是否超大音符
             return True
         
         return False
@@ -227,9 +231,7 @@ class NoteJudgment:
             return None
         
         start_idx, end_idx, dr_type, hits = self.active_drumroll
-        end_note_time = end_note.hit_ms if hasattr(end_note, 'hit_ms') else end_note.time_ms
-        
-        if game_time >= end_note_time:
+        if game_time >= end_note.hit_ms:
             # 连打/气球结束 - 真打分数规则
             import math
             score = 0
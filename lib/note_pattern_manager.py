@@ -6,15 +6,101 @@ Note Pattern Manager
 Manages note patterns and visual effects
 """
 
+import os
 import pygame
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, Optional, Tuple
+from typing import Dict, Iterable, Optional, Tuple
 import math
 
 
+# 变体缓存的量化步长：缩放按0.02、旋转按5度取整，避免连续动画值撑爆缓存
+VARIANT_SCALE_STEP = 0.02
+VARIANT_ROTATION_STEP = 5
+# 透明度按16取整（约16档），淡入淡出过程只会产生少量不同的变体
+VARIANT_ALPHA_STEP = 16
+
+# 图案图集的最大宽度（常见GPU纹理尺寸上限）
+ATLAS_MAX_WIDTH = 2048
+
+# 并行解码图案PNG的线程数
+PATTERN_LOAD_WORKERS = 8
+
+# 连击>20时音符使用两帧动画，每帧持续的时间（毫秒）
+ANIM_COMBO_THRESHOLD = 20
+ANIM_FRAME_MS = 200
+# 音符类型 → 图案名称（连击<=20时的静态图案）
+_STATIC_NOTE_PATTERNS = {
+    1: 'don',        # don1.png
+    2: 'a',          # a1.png (ka1.png)
+    3: 'big_don1',   # big_don1.png
+    4: 'big_ka1',    # big_ka1.png
+}
+# 音符类型 → 图案名称（连击>20时的动画帧，按帧号索引）
+_ANIM_NOTE_PATTERNS = (
+    {1: 'don2', 2: 'ka2', 3: 'big_don2', 4: 'big_ka2'},
+    {1: 'don3', 2: 'ka3', 3: 'big_don3', 4: 'big_ka3'},
+)
+
+
+def select_note_pattern(note_type: int, combo: int = 0, game_time: float = 0) -> str:
+    """
+    根据音符类型、连击数和游戏时间选择图案名称（支持动态动画）
+    
+    Args:
+        note_type: 音符类型
+        combo: 当前连击数
+        game_time: 当前游戏时间（毫秒）
+        
+    Returns:
+        str: 图案名称，未知类型返回空字符串
+    """
+    if combo > ANIM_COMBO_THRESHOLD:
+        # 根据游戏时间计算当前帧（200ms一帧，2帧循环）
+        return _ANIM_NOTE_PATTERNS[int(game_time / ANIM_FRAME_MS) % 2].get(note_type, '')
+    return _STATIC_NOTE_PATTERNS.get(note_type, '')
+
+
 class NotePatternManager:
     """音符图案管理器"""
     
+    __slots__ = ('res_dir', 'patterns', 'atlas', '_get',
+                 '_variant_cache', 'max_variant_cache_size',
+                 '_info_cache', '_stats_cache')
+    
+    # 音符类型定义：(图案名称, 文件名)，所有实例共享，仅在加载时遍历
+    _NOTE_TYPES = (
+        ('don', 'don1.png'),            # 1 咚音符（连击<=20）
+        ('don2', 'don2.png'),           # 1 咚音符（连击>20，动画帧1）
+        ('don3', 'don3.png'),           # 1 咚音符（连击>20，动画帧2）
+        ('a', 'a1.png'),                # 2 咔音符（连击<=20）
+        ('ka2', 'ka2.png'),             # 2 咔音符（连击>20，动画帧1）
+        ('ka3', 'ka3.png'),             # 2 咔音符（连击>20，动画帧2）
+        ('big_don', 'big_don3.png'),    # 3 大咚音符（默认）
+        ('big_don1', 'big_don1.png'),   # 3 大咚音符（连击<=20）
+        ('big_don2', 'big_don2.png'),   # 3 大咚音符（连击>20，动画帧1）
+        ('big_don3', 'big_don3.png'),   # 3 大咚音符（连击>20，动画帧2）
+        ('big_ka', 'big_ka3.png'),      # 4 大咔音符（默认）
+        ('big_ka1', 'big_ka1.png'),     # 4 大咔音符（连击<=20）
+        ('big_ka2', 'big_ka2.png'),     # 4 大咔音符（连击>20，动画帧1）
+        ('big_ka3', 'big_ka3.png'),     # 4 大咔音符（连击>20，动画帧2）
+        # 连打音符图案
+        ('rapid_tail', 'rapid_tail.png'),      # 5 连打尾部
+        ('rapid_front', 'front.png'),          # 5 连打头部（连击<=20）
+        ('front2', 'front2.png'),              # 5 连打头部（连击>20，动画帧1）
+        ('front3', 'front3.png'),              # 5 连打头部（连击>20，动画帧2）
+        ('rapid_body', 'rapid.png'),           # 5 连打主体
+        ('big_rapid_tail', 'big_rapid_tail.png'),  # 6 大连打尾部
+        ('big_rapid_front', 'big_front2.png'),     # 6 大连打头部
+        ('big_rapid_body', 'big_rapid.png'),       # 6 大连打主体
+        ('balloon_tail', 'ballon_tail2.png'),      # 7 气球尾部
+        ('balloon_front', 'ballon_front.png'),     # 7 气球头部（连击<=20）
+        ('ballon_front2', 'ballon_front2.png'),    # 7 气球头部（连击>20，动画帧1）
+        ('ballon_front3', 'ballon_front3.png'),    # 7 气球头部（连击>20，动画帧2）
+        ('balloon_body', 'ballon_tail.png'),       # 7 气球主体
+    )
+    
     def __init__(self, res_dir: Path = None):
         """
         初始化音符图案管理器
@@ -26,68 +112,69 @@ class NotePatternManager:
             res_dir = Path("lib/res/Texture/note")
         self.res_dir = Path(res_dir)
         
-        # 音符图案字典
+        # 音符图案字典（加载后均为图集的子表面）
         self.patterns: Dict[str, pygame.Surface] = {}
+        # 所有图案打包后的图集表面
+        self.atlas: Optional[pygame.Surface] = None
+        
+        # 变换后图案缓存 (使用OrderedDict实现LRU)
+        # key: (图案名称, 量化缩放, 量化旋转, 透明度)
+        self._variant_cache = OrderedDict()
+        self.max_variant_cache_size = 256
         
-        # 音符类型定义
-        self.note_types = {
-            'don': 'don1.png',            # 1 咚音符（连击<=20）
-            'don2': 'don2.png',           # 1 咚音符（连击>20，动画帧1）
-            'don3': 'don3.png',           # 1 咚音符（连击>20，动画帧2）
-            'a': 'a1.png',                # 2 咔音符（连击<=20）
-            'ka2': 'ka2.png',             # 2 咔音符（连击>20，动画帧1）
-            'ka3': 'ka3.png',             # 2 咔音符（连击>20，动画帧2）
-            'big_don': 'big_don3.png',    # 3 大咚音符（默认）
-            'big_don1': 'big_don1.png',   # 3 大咚音符（连击<=20）
-            'big_don2': 'big_don2.png',   # 3 大咚音符（连击>20，动画帧1）
-            'big_don3': 'big_don3.png',   # 3 大咚音符（连击>20，动画帧2）
-            'big_ka': 'big_ka3.png',      # 4 大咔音符（默认）
-            'big_ka1': 'big_ka1.png',     # 4 大咔音符（连击<=20）
-            'big_ka2': 'big_ka2.png',     # 4 大咔音符（连击>20，动画帧1）
-            'big_ka3': 'big_ka3.png',     # 4 大咔音符（连击>20，动画帧2）
-            # 连打音符图案
-            'rapid_tail': 'rapid_tail.png',      # 5 连打尾部
-            'rapid_front': 'front.png',          # 5 连打头部（连击<=20）
-            'front2': 'front2.png',              # 5 连打头部（连击>20，动画帧1）
-            'front3': 'front3.png',              # 5 连打头部（连击>20，动画帧2）
-            'rapid_body': 'rapid.png',           # 5 连打主体
-            'big_rapid_tail': 'big_rapid_tail.png',  # 6 大连打尾部
-            'big_rapid_front': 'big_front2.png',     # 6 大连打头部
-            'big_rapid_body': 'big_rapid.png',       # 6 大连打主体
-            'balloon_tail': 'ballon_tail2.png',      # 7 气球尾部
-            'balloon_front': 'ballon_front.png',     # 7 气球头部（连击<=20）
-            'ballon_front2': 'ballon_front2.png',    # 7 气球头部（连击>20，动画帧1）
-            'ballon_front3': 'ballon_front3.png',    # 7 气球头部（连击>20，动画帧2）
-            'balloon_body': 'ballon_tail.png'        # 7 气球主体
-        }
+        # get_pattern_info / get_stats 的结果缓存，图案变化时失效
+        self._info_cache: Optional[Dict[str, Dict]] = None
+        self._stats_cache: Optional[Dict] = None
         
         # 加载所有音符图案
         self._load_patterns()
+        
+        # 绑定方法缓存为属性，热路径上少一次属性查找
+        self._get = self.patterns.get
     
     def _load_patterns(self):
         """加载所有音符图案"""
         print("Loading note patterns...")
         
-        for pattern_name, filename in self.note_types.items():
-            pattern_path = self.res_dir / filename
+        # 一次扫描资源目录得到所有文件名，之后只做集合查询，不再逐个 stat
+        try:
+            with os.scandir(self.res_dir) as entries:
+                present = {entry.name for entry in entries if entry.is_file()}
+        except OSError:
+            present = set()
+        
+        # PNG解码（image.load）在线程池中并行进行，同一文件只解码一次；
+        # 格式转换依赖显示表面，留在主线程执行
+        with ThreadPoolExecutor(max_workers=PATTERN_LOAD_WORKERS) as executor:
+            futures = {}
+            for pattern_name, filename in self._NOTE_TYPES:
+                if filename in present:
+                    if filename not in futures:
+                        futures[filename] = executor.submit(pygame.image.load,
+                                                            str(self.res_dir / filename))
+                else:
+                    print(f"Pattern file not found: {self.res_dir / filename}")
             
-            if pattern_path.exists():
+            converted = {}
+            for pattern_name, filename in self._NOTE_TYPES:
+                future = futures.get(filename)
+                if future is None:
+                    continue
                 try:
-                    pattern = pygame.image.load(str(pattern_path)).convert_alpha()
-                    self.patterns[pattern_name] = pattern
+                    if filename not in converted:
+                        converted[filename] = self._convert_pattern(future.result())
+                    self.patterns[pattern_name] = converted[filename]
                     print(f"Loaded pattern: {pattern_name} from {filename}")
                 except Exception as e:
                     print(f"Failed to load pattern {pattern_name}: {e}")
-            else:
-                print(f"Pattern file not found: {pattern_path}")
         
         # 如果没有找到a1.png，尝试使用其他替代
         if 'a' not in self.patterns:
             # 尝试使用ka1.png作为替代
             alt_path = self.res_dir / "ka1.png"
-            if alt_path.exists():
+            if alt_path.name in present:
                 try:
-                    pattern = pygame.image.load(str(alt_path)).convert_alpha()
+                    pattern = self._convert_pattern(pygame.image.load(str(alt_path)))
                     self.patterns['a'] = pattern
                     print(f"Using ka1.png as substitute for a1.png")
                 except Exception as e:
@@ -95,6 +182,10 @@ class NotePatternManager:
             else:
                 print(f"Warning: a1.png not found and no substitute available")
         
+        # 将所有图案打包进一张图集
+        self._build_atlas()
+        self._invalidate_info()
+        
         # 为类型9的气球使用与类型7相同的图案
         if 'balloon_tail' in self.patterns:
             self.patterns['balloon9_tail'] = self.patterns['balloon_tail']
@@ -103,6 +194,75 @@ class NotePatternManager:
         if 'balloon_body' in self.patterns:
             self.patterns['balloon9_body'] = self.patterns['balloon_body']
     
+    @staticmethod
+    def _convert_pattern(surface: pygame.Surface) -> pygame.Surface:
+        """
+        将解码后的图案转换为显示格式
+        
+        完全不透明的图案使用 convert()（无逐像素alpha，绘制走快速的不透明 blitter），
+        其余使用 convert_alpha()
+        
+        Args:
+            surface: image.load 得到的表面
+            
+        Returns:
+            pygame.Surface: 转换后的表面
+        """
+        converted = surface.convert_alpha()
+        # 阈值254：只有alpha为255的像素计入，全部计入即为完全不透明
+        if pygame.mask.from_surface(converted, 254).count() == surface.get_width() * surface.get_height():
+            return surface.convert()
+        return converted
+    
+    def _build_atlas(self):
+        """
+        将已加载的图案打包进一张图集（按高度分行的 shelf 打包）
+        
+        打包后 self.patterns 中的每个图案替换为图集的子表面，
+        子表面与图集共享像素内存，所有图案的绘制都来自同一个源表面，
+        对外仍然是普通的 pygame.Surface；不透明图案（无SRCALPHA）保持独立表面
+        """
+        # 多个名称可能共用同一张图（同一文件只加载一次），只打包一份
+        sources = list({id(pattern): pattern for pattern in self.patterns.values()
+                        if pattern.get_flags() & pygame.SRCALPHA}.values())
+        if not sources:
+            return
+        
+        # 按高度从大到小排列，同一行内高度接近，浪费更少
+        sources.sort(key=lambda pattern: pattern.get_height(), reverse=True)
+        atlas_width = max(ATLAS_MAX_WIDTH, max(p.get_width() for p in sources))
+        
+        placements = []
+        shelf_x = shelf_y = shelf_height = 0
+        for pattern in sources:
+            width, height = pattern.get_size()
+            if shelf_x + width > atlas_width:
+                # 当前行放不下，另起一行
+                shelf_y += shelf_height
+                shelf_x = shelf_height = 0
+            placements.append((pattern, pygame.Rect(shelf_x, shelf_y, width, height)))
+            shelf_x += width
+            shelf_height = max(shelf_height, height)
+        
+        used_width = max(rect.right for _, rect in placements)
+        atlas = pygame.Surface((used_width, shelf_y + shelf_height), pygame.SRCALPHA).convert_alpha()
+        atlas.fill((0, 0, 0, 0))
+        subsurfaces = {}
+        for pattern, rect in placements:
+            # BLEND_RGBA_MAX 写入全透明图集等同于原样复制（包括alpha通道）
+            atlas.blit(pattern, rect.topleft, special_flags=pygame.BLEND_RGBA_MAX)
+            subsurfaces[id(pattern)] = atlas.subsurface(rect)
+        for name, pattern in self.patterns.items():
+            self.patterns[name] = subsurfaces.get(id(pattern), pattern)
+        
+        self.atlas = atlas
+        print(f"Packed {len(placements)} patterns into atlas {atlas.get_width()}x{atlas.get_height()}")
+    
+    @property
+    def note_types(self) -> Dict[str, str]:
+        """音符类型定义（图案名称 → 文件名），按需构建"""
+        return dict(self._NOTE_TYPES)
+    
     def get_pattern(self, pattern_name: str) -> Optional[pygame.Surface]:
         """
         获取音符图案
@@ -113,7 +273,7 @@ class NotePatternManager:
         Returns:
             pygame.Surface: 音符图案，如果不存在则返回None
         """
-        return self.patterns.get(pattern_name)
+        return self._get(pattern_name)
     
     def get_pattern_size(self, pattern_name: str) -> Tuple[int, int]:
         """
@@ -148,30 +308,119 @@ class NotePatternManager:
         Returns:
             bool: 是否成功绘制
         """
-        pattern = self.get_pattern(pattern_name)
-        if not pattern:
+        # 无任何变换时直接绘制原图，跳过变体缓存（最常见的情况）
+        if scale == 1.0 and rotation % 360 == 0.0 and alpha == 255:
+            pattern = self._get(pattern_name)
+            if not pattern:
+                return False
+            surface.blit(pattern, (x, y))
+            return True
+        
+        draw_pattern = self._get_variant(pattern_name, scale, rotation, alpha)
+        if not draw_pattern:
             return False
         
-        # 创建图案副本
-        draw_pattern = pattern.copy()
+        # 绘制图案（缓存变体为预乘alpha格式）
+        surface.blit(draw_pattern, (x, y), special_flags=pygame.BLEND_PREMULTIPLIED)
+        return True
+    
+    def draw_patterns_batch(self, surface: pygame.Surface, items: Iterable[Tuple],
+                            blend_flag: int = pygame.BLEND_PREMULTIPLIED) -> int:
+        """
+        批量绘制音符图案（一次 blits 调用代替逐个 draw_pattern）
         
-        # 应用缩放
+        Args:
+            surface: 目标表面
+            items: (图案名称, x, y, 缩放, 旋转, 透明度) 元组序列，坐标为左上角
+            blend_flag: 混合模式标志（pygame.BLEND_*），图案为预乘alpha格式
+            
+        Returns:
+            int: 实际绘制的图案数量
+        """
+        get_variant = self._get_variant
+        blit_list = []
+        for pattern_name, x, y, scale, rotation, alpha in items:
+            variant = get_variant(pattern_name, scale, rotation, alpha)
+            if variant:
+                blit_list.append((variant, (x, y)))
+        
+        if not blit_list:
+            return 0
+        
+        # pygame-ce 提供更快的 fblits，标准 pygame 回退到 blits
+        fblits = getattr(surface, 'fblits', None)
+        if fblits is not None:
+            fblits(blit_list, blend_flag)
+        else:
+            surface.blits([(variant, pos, None, blend_flag) for variant, pos in blit_list],
+                          doreturn=False)
+        return len(blit_list)
+    
+    def _get_variant(self, pattern_name: str, scale: float = 1.0,
+                     rotation: float = 0.0, alpha: int = 255) -> Optional[pygame.Surface]:
+        """
+        获取缩放/旋转/透明度处理后的图案（带LRU缓存）
+        
+        缩放和旋转先量化再作为缓存key，同一组参数只变换一次，
+        之后每帧直接复用缓存的Surface
+        
+        返回的变体为预乘alpha格式（透明度也已乘入像素），
+        必须使用 pygame.BLEND_PREMULTIPLIED 绘制
+        
+        Args:
+            pattern_name: 图案名称
+            scale: 缩放比例
+            rotation: 旋转角度（度）
+            alpha: 透明度 (0-255)
+            
+        Returns:
+            pygame.Surface: 处理后的图案（预乘alpha），如果不存在则返回None
+        """
+        scale_steps = round(scale / VARIANT_SCALE_STEP)
+        rotation_steps = round(rotation / VARIANT_ROTATION_STEP) % (360 // VARIANT_ROTATION_STEP)
+        alpha = min(255, round(alpha / VARIANT_ALPHA_STEP) * VARIANT_ALPHA_STEP)
+        cache_key = (pattern_name, scale_steps, rotation_steps, alpha)
+        
+        cache = self._variant_cache
+        variant = cache.get(cache_key)
+        if variant is not None:
+            cache.move_to_end(cache_key)
+            return variant
+        
+        pattern = self._get(pattern_name)
+        if not pattern:
+            return None
+        
+        variant = pattern
+        
+        # 不透明图案没有alpha通道，需要先转换才能预乘并叠加透明度
+        if not variant.get_flags() & pygame.SRCALPHA:
+            variant = variant.convert_alpha()
+        
+        # 应用缩放（使用量化后的比例）
+        scale = scale_steps * VARIANT_SCALE_STEP
         if scale != 1.0:
-            orig_size = draw_pattern.get_size()
+            orig_size = variant.get_size()
             new_size = (int(orig_size[0] * scale), int(orig_size[1] * scale))
-            draw_pattern = pygame.transform.scale(draw_pattern, new_size)
+            variant = pygame.transform.scale(variant, new_size)
+        
+        # 应用旋转（使用量化后的角度）
+        rotation = rotation_steps * VARIANT_ROTATION_STEP
+        if rotation != 0:
+            variant = pygame.transform.rotate(variant, rotation)
         
-        # 应用旋转
-        if rotation != 0.0:
-            draw_pattern = pygame.transform.rotate(draw_pattern, rotation)
+        # 转换为预乘alpha（返回新表面，原图案不受影响），
+        # 绘制时走 BLEND_PREMULTIPLIED 快速路径，不再逐像素做alpha混合
+        variant = variant.premul_alpha()
         
-        # 应用透明度
+        # 应用透明度：预乘格式下把四个通道同乘 alpha/255
         if alpha < 255:
-            draw_pattern.set_alpha(alpha)
+            variant.fill((alpha, alpha, alpha, alpha), special_flags=pygame.BLEND_RGBA_MULT)
         
-        # 绘制图案
-        surface.blit(draw_pattern, (x, y))
-        return True
+        cache[cache_key] = variant
+        if len(cache) > self.max_variant_cache_size:
+            cache.popitem(last=False)
+        return variant
     
     def draw_pattern_centered(self, surface: pygame.Surface, pattern_name: str,
                              center_x: int, center_y: int, scale: float = 1.0,
@@ -191,20 +440,24 @@ class NotePatternManager:
         Returns:
             bool: 是否成功绘制
         """
-        pattern = self.get_pattern(pattern_name)
-        if not pattern:
-            return False
-        
-        # 计算图案尺寸
-        orig_width, orig_height = pattern.get_size()
-        scaled_width = int(orig_width * scale)
-        scaled_height = int(orig_height * scale)
+        # 无任何变换时直接绘制原图，跳过变体缓存（最常见的情况）
+        if scale == 1.0 and rotation % 360 == 0.0 and alpha == 255:
+            pattern = self._get(pattern_name)
+            if not pattern:
+                return False
+            width, height = pattern.get_size()
+            surface.blit(pattern, (center_x - width // 2, center_y - height // 2))
+            return True
         
-        # 计算绘制位置（居中）
-        x = center_x - scaled_width // 2
-        y = center_y - scaled_height // 2
+        variant = self._get_variant(pattern_name, scale, rotation, alpha)
+        if not variant:
+            return False
         
-        return self.draw_pattern(surface, pattern_name, x, y, scale, rotation, alpha)
+        # 计算绘制位置（居中，直接使用缓存变体的实际尺寸）
+        width, height = variant.get_size()
+        surface.blit(variant, (center_x - width // 2, center_y - height // 2),
+                     special_flags=pygame.BLEND_PREMULTIPLIED)
+        return True
     
     def get_available_patterns(self) -> list:
         """
@@ -222,6 +475,9 @@ class NotePatternManager:
         Returns:
             Dict[str, Dict]: 图案信息字典
         """
+        if self._info_cache is not None:
+            return self._info_cache
+        
         info = {}
         for pattern_name, pattern in self.patterns.items():
             width, height = pattern.get_size()
@@ -229,6 +485,7 @@ class NotePatternManager:
                 'size': (width, height),
                 'loaded': True
             }
+        self._info_cache = info
         return info
     
     def create_pattern_variant(self, pattern_name: str, variant_name: str,
@@ -237,6 +494,9 @@ class NotePatternManager:
         """
         创建图案变体
         
+        变体以普通（非预乘）alpha 保存到图案字典，绘制时才会转换为预乘格式；
+        color_mod 只作用于RGB通道，与预乘转换可交换，结果一致
+        
         Args:
             pattern_name: 原始图案名称
             variant_name: 变体名称
@@ -251,8 +511,8 @@ class NotePatternManager:
         if not pattern:
             return False
         
-        # 创建变体
-        variant = pattern.copy()
+        # 创建变体（缩放/旋转本身就会生成新表面，无需预先复制）
+        variant = pattern
         
         # 应用缩放
         if scale != 1.0:
@@ -260,21 +520,78 @@ class NotePatternManager:
             new_size = (int(orig_size[0] * scale), int(orig_size[1] * scale))
             variant = pygame.transform.scale(variant, new_size)
         
-        # 应用旋转
-        if rotation != 0.0:
+        # 应用旋转（整圈旋转等于不旋转）
+        if rotation % 360 != 0.0:
             variant = pygame.transform.rotate(variant, rotation)
         
-        # 应用颜色修改
+        # 应用颜色修改（原地修改，仍是原图时先复制一份）
         if color_mod:
+            if variant is pattern:
+                variant = pattern.copy()
             variant.fill(color_mod, special_flags=pygame.BLEND_MULT)
         
         # 保存变体
         self.patterns[variant_name] = variant
+        # 同名图案被覆盖时，旧的变换缓存失效
+        self._drop_variants(variant_name)
+        self._invalidate_info()
         return True
     
+    def create_color_variants(self, pattern_name: str,
+                              colors: Dict[str, Tuple[int, int, int]],
+                              scale: float = 1.0, rotation: float = 0.0) -> int:
+        """
+        批量创建只有颜色不同的图案变体
+        
+        缩放和旋转只做一次，每种颜色只需复制变换结果并做一次 BLEND_MULT 填充
+        
+        Args:
+            pattern_name: 原始图案名称
+            colors: 变体名称 → 颜色修改 (R, G, B)
+            scale: 缩放比例
+            rotation: 旋转角度
+            
+        Returns:
+            int: 成功创建的变体数量
+        """
+        pattern = self.get_pattern(pattern_name)
+        if not pattern:
+            return 0
+        
+        # 共用的变换结果
+        base = pattern
+        if scale != 1.0:
+            orig_size = base.get_size()
+            new_size = (int(orig_size[0] * scale), int(orig_size[1] * scale))
+            base = pygame.transform.scale(base, new_size)
+        if rotation % 360 != 0.0:
+            base = pygame.transform.rotate(base, rotation)
+        
+        for variant_name, color_mod in colors.items():
+            variant = base.copy()
+            variant.fill(color_mod, special_flags=pygame.BLEND_MULT)
+            self.patterns[variant_name] = variant
+            self._drop_variants(variant_name)
+        self._invalidate_info()
+        return len(colors)
+    
+    def _drop_variants(self, pattern_name: str):
+        """移除指定图案的所有变换缓存"""
+        stale_keys = [key for key in self._variant_cache if key[0] == pattern_name]
+        for key in stale_keys:
+            del self._variant_cache[key]
+    
+    def _invalidate_info(self):
+        """图案字典变化后，使信息/统计缓存失效"""
+        self._info_cache = None
+        self._stats_cache = None
+    
     def clear_patterns(self):
         """清空所有图案"""
         self.patterns.clear()
+        self._variant_cache.clear()
+        self.atlas = None
+        self._invalidate_info()
     
     def reload_patterns(self):
         """重新加载所有图案"""
@@ -288,9 +605,11 @@ class NotePatternManager:
         Returns:
             Dict: 统计信息
         """
-        return {
-            'total_patterns': len(self.patterns),
-            'available_patterns': list(self.patterns.keys()),
-            'resource_dir': str(self.res_dir),
-            'note_types': self.note_types
-        }
+        if self._stats_cache is None:
+            self._stats_cache = {
+                'total_patterns': len(self.patterns),
+                'available_patterns': list(self.patterns.keys()),
+                'resource_dir': str(self.res_dir),
+                'note_types': self.note_types
+            }
+        return self._stats_cache
@@ -40,6 +40,12 @@ def external_storage_dir() -> Path:
     return APP_ROOT
 
 
+def cache_dir() -> Path:
+    if is_android():
+        return user_data_dir() / "cache"
+    return Path.home() / ".cache" / "taikomini"
+
+
 def root_choice_file() -> Path:
     return user_data_dir() / "taikomini_root.txt"
 
@@ -7,6 +7,7 @@ Independent practice mode controls including speed, pause, auto, and reset butto
 """
 
 import pygame
+from functools import partial
 
 # Colors
 BLACK = (0, 0, 0)
@@ -19,6 +20,13 @@ LIGHT_BLUE = (100, 150, 255)
 class PracticeControls:
     """练习模式控件类"""
     
+    __slots__ = ('screen', 'screen_width', 'screen_height', 'font_small', 'is_auto_play',
+                 '_label_cache', '_speed_values', '_speed_rects', 'play_pause_rect',
+                 'restart_rect', 'auto_play_rect', 'control_area_height', 'control_area_y',
+                 '_button_rects', '_dispatch_table', '_bar_rect', '_num_speeds',
+                 '_speed_x0', '_speed_stride', '_action_x0', '_action_stride',
+                 '_btn_bg', '_static_blits', '_play_label_blit', '_pause_label_blit')
+    
     def __init__(self, screen):
         """
         初始化练习模式控件
@@ -32,13 +40,16 @@ class PracticeControls:
 
         # 字体设置
         self.font_small = pygame.font.Font(None, 36)
-        self.font_large = pygame.font.Font(None, 72)
         
         # 控件状态
         self.is_auto_play = False
         
+        # 按钮文字缓存（文字固定不变，只渲染一次）
+        self._label_cache = {}
+        
         # UI元素
-        self.speed_buttons = {}
+        self._speed_values = []
+        self._speed_rects = []
         self.play_pause_rect = pygame.Rect(0, 0, 0, 0)
         self.restart_rect = pygame.Rect(0, 0, 0, 0)
         self.auto_play_rect = pygame.Rect(0, 0, 0, 0)
@@ -83,22 +94,145 @@ class PracticeControls:
         start_x = (self.screen_width - total_bar_width) / 2
         current_x = start_x
         start_y = self.control_area_y
+        # 矩形使用整数像素尺寸（只取整一次）；current_x 仍按浮点累加，保持按钮间距均匀
+        speed_width = int(button_widths['speed'])
+        action_width = int(button_widths['action'])
 
         # 速度按钮
-        self.speed_buttons = {}
+        # 速度值与按钮矩形分别存放在两个并行列表中，按顺序一一对应
+        self._speed_values = list(speeds)
+        self._speed_rects = []
         for speed in speeds:
-            rect = pygame.Rect(current_x, start_y, button_widths['speed'], button_height)
-            self.speed_buttons[speed] = rect
+            rect = pygame.Rect(int(current_x), start_y, speed_width, button_height)
+            self._speed_rects.append(rect)
             current_x += button_widths['speed'] + button_spacing
 
         # 其他按钮 (Pause, Auto, Restart)
-        self.play_pause_rect = pygame.Rect(current_x, start_y, button_widths['action'], button_height)
+        self.play_pause_rect = pygame.Rect(int(current_x), start_y, action_width, button_height)
         current_x += button_widths['action'] + button_spacing
         
-        self.auto_play_rect = pygame.Rect(current_x, start_y, button_widths['action'], button_height)
+        self.auto_play_rect = pygame.Rect(int(current_x), start_y, action_width, button_height)
         current_x += button_widths['action'] + button_spacing
         
-        self.restart_rect = pygame.Rect(current_x, start_y, button_widths['action'], button_height)
+        self.restart_rect = pygame.Rect(int(current_x), start_y, action_width, button_height)
+        
+        # 按序号排列的按钮矩形与对应的处理函数
+        self._button_rects = self._speed_rects + [
+            self.play_pause_rect, self.auto_play_rect, self.restart_rect]
+        self._dispatch_table = [partial(self._on_speed_button, speed) for speed in speeds] + [
+            self._on_play_pause_button, self._on_auto_play_button, self._on_restart_button]
+        
+        # 点击检测用：整个控件条的包围矩形 + 按钮等宽等距，可由x坐标直接算出按钮序号
+        self._bar_rect = self._button_rects[0].unionall(self._button_rects[1:])
+        self._num_speeds = num_speed_buttons
+        self._speed_x0 = start_x
+        self._speed_stride = button_widths['speed'] + button_spacing
+        self._action_x0 = self.play_pause_rect.x
+        self._action_stride = button_widths['action'] + button_spacing
+        
+        # 预渲染按钮背景（圆角矩形每帧绘制开销较大，同尺寸同颜色只画一次）
+        speed_size = self._button_rects[0].size
+        action_size = self.play_pause_rect.size
+        self._btn_bg = {
+            ('speed', 'green'): self._render_button_bg(speed_size, GREEN, 5, outline=True),
+            ('speed', 'dark'): self._render_button_bg(speed_size, DARK_GRAY, 5, outline=True),
+            ('action', 'dark'): self._render_button_bg(action_size, DARK_GRAY, 8),
+            ('action', 'blue'): self._render_button_bg(action_size, LIGHT_BLUE, 8),
+        }
+        
+        # 预渲染按钮文字
+        labels = [f"{speed}x" for speed in speeds] + ["Play", "Pause", "Auto", "Restart"]
+        for label in labels:
+            if label not in self._label_cache:
+                self._label_cache[label] = self.font_small.render(label, True, WHITE).convert_alpha()
+        
+        # 与每帧状态无关的绘制项（按钮不重叠，只需保证同一按钮先画背景后画文字）
+        label_pos = self._label_position
+        self._static_blits = [
+            (self._label_cache[f"{speed}x"], label_pos(f"{speed}x", rect))
+            for speed, rect in zip(self._speed_values, self._speed_rects)
+        ] + [
+            (self._btn_bg[('action', 'dark')], self.play_pause_rect.topleft),
+            (self._label_cache["Auto"], label_pos("Auto", self.auto_play_rect)),
+            (self._btn_bg[('action', 'dark')], self.restart_rect.topleft),
+            (self._label_cache["Restart"], label_pos("Restart", self.restart_rect)),
+        ]
+        self._play_label_blit = (self._label_cache["Play"], label_pos("Play", self.play_pause_rect))
+        self._pause_label_blit = (self._label_cache["Pause"], label_pos("Pause", self.play_pause_rect))
+    
+    def _label_position(self, label, rect):
+        """计算按钮文字居中绘制的左上角坐标"""
+        return self._label_cache[label].get_rect(center=rect.center).topleft
+    
+    @property
+    def speed_buttons(self):
+        """速度按钮字典（速度 → 按钮矩形），兼容旧接口，按需构建"""
+        return dict(zip(self._speed_values, self._speed_rects))
+    
+    def _render_button_bg(self, size, color, border_radius, outline=False):
+        """
+        预渲染一个圆角按钮背景
+        
+        Args:
+            size: tuple - 按钮尺寸
+            color: tuple - 填充颜色
+            border_radius: int - 圆角半径
+            outline: bool - 是否绘制白色描边
+            
+        Returns:
+            pygame.Surface: 按钮背景表面
+        """
+        surface = pygame.Surface(size, pygame.SRCALPHA)
+        rect = surface.get_rect()
+        pygame.draw.rect(surface, color, rect, border_radius=border_radius)
+        if outline:
+            pygame.draw.rect(surface, WHITE, rect, 2, border_radius=border_radius)
+        return surface.convert_alpha()
+    
+    def _hit_button(self, pos):
+        """
+        根据点击位置计算按钮序号
+        
+        Args:
+            pos: tuple - 点击坐标
+            
+        Returns:
+            int: 按钮序号，未点中任何按钮返回-1
+        """
+        if not self._bar_rect.collidepoint(pos):
+            return -1
+        
+        x = pos[0]
+        if x < self._action_x0:
+            index = int((x - self._speed_x0) // self._speed_stride)
+        else:
+            index = self._num_speeds + int((x - self._action_x0) // self._action_stride)
+        
+        # 矩形坐标被取整，边缘像素可能落到相邻按钮，顺带检查下一个
+        rects = self._button_rects
+        for candidate in (index, index + 1):
+            if 0 <= candidate < len(rects) and rects[candidate].collidepoint(pos):
+                return candidate
+        return -1
+    
+    def _on_speed_button(self, speed, current_speed):
+        """速度按钮：切换到不同速度"""
+        if speed != current_speed:
+            return {'action': 'change_speed', 'value': speed}
+        return None
+    
+    def _on_play_pause_button(self, current_speed):
+        """Play/Pause按钮"""
+        return {'action': 'toggle_pause'}
+    
+    def _on_auto_play_button(self, current_speed):
+        """Auto Play按钮"""
+        self.is_auto_play = not self.is_auto_play
+        return {'action': 'toggle_auto'}
+    
+    def _on_restart_button(self, current_speed):
+        """Restart按钮"""
+        return {'action': 'restart'}
         
     def handle_event(self, event, current_speed, is_paused):
         """
@@ -113,22 +247,10 @@ class PracticeControls:
             dict or None: 如果控件被激活则返回动作字典，否则返回None
         """
         if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
-            # 速度按钮
-            for speed, rect in self.speed_buttons.items():
-                if rect.collidepoint(event.pos):
-                    if speed != current_speed:
-                        return {'action': 'change_speed', 'value': speed}
-            
-            # 控制按钮
-            if self.play_pause_rect.collidepoint(event.pos):
-                return {'action': 'toggle_pause'}
-            
-            if self.restart_rect.collidepoint(event.pos):
-                return {'action': 'restart'}
-                
-            if self.auto_play_rect.collidepoint(event.pos):
-                self.is_auto_play = not self.is_auto_play
-                return {'action': 'toggle_auto'}
+            # 先判断是否在控件条内，再由x坐标直接定位按钮
+            index = self._hit_button(event.pos)
+            if index >= 0:
+                return self._dispatch_table[index](current_speed)
 
         if event.type == pygame.KEYDOWN:
             if event.key == pygame.K_a:
@@ -145,37 +267,22 @@ class PracticeControls:
             current_speed: float - 当前速度
             is_paused: bool - 是否暂停
         """
-        # 速度按钮
-        for speed, rect in self.speed_buttons.items():
-            bg_color = GREEN if abs(speed - current_speed) < 0.01 else DARK_GRAY
-            pygame.draw.rect(self.screen, bg_color, rect, border_radius=5)
-            pygame.draw.rect(self.screen, WHITE, rect, 2, border_radius=5)
-            
-            speed_text = f"{speed}x"
-            text_surface = self.font_small.render(speed_text, True, WHITE)
-            text_rect = text_surface.get_rect(center=rect.center)
-            self.screen.blit(text_surface, text_rect)
-
-        # Play/Pause按钮
-        pygame.draw.rect(self.screen, DARK_GRAY, self.play_pause_rect, border_radius=8)
+        btn_bg = self._btn_bg
         
-        btn_text = "Play" if is_paused else "Pause"
-        text_surface = self.font_small.render(btn_text, True, WHITE)
-        text_rect = text_surface.get_rect(center=self.play_pause_rect.center)
-        self.screen.blit(text_surface, text_rect)
-
-        # Auto Play按钮
-        bg_color = LIGHT_BLUE if self.is_auto_play else DARK_GRAY
-        pygame.draw.rect(self.screen, bg_color, self.auto_play_rect, border_radius=8)
-        text_surface = self.font_small.render("Auto", True, WHITE)
-        text_rect = text_surface.get_rect(center=self.auto_play_rect.center)
-        self.screen.blit(text_surface, text_rect)
-        
-        # Restart按钮
-        pygame.draw.rect(self.screen, DARK_GRAY, self.restart_rect, border_radius=8)
-        text_surface = self.font_small.render("Restart", True, WHITE)
-        text_rect = text_surface.get_rect(center=self.restart_rect.center)
-        self.screen.blit(text_surface, text_rect)
+        # 随状态变化的背景：速度按钮（当前速度高亮）、Auto Play按钮
+        blit_list = [
+            (btn_bg[('speed', 'green' if abs(speed - current_speed) < 0.01 else 'dark')], rect.topleft)
+            for speed, rect in zip(self._speed_values, self._speed_rects)
+        ]
+        blit_list.append((btn_bg[('action', 'blue' if self.is_auto_play else 'dark')],
+                          self.auto_play_rect.topleft))
+        
+        # 固定内容（文字、Play/Pause与Restart背景），最后是Play/Pause文字
+        blit_list += self._static_blits
+        blit_list.append(self._play_label_blit if is_paused else self._pause_label_blit)
+        
+        # 一次blits调用绘制全部控件
+        self.screen.blits(blit_list, doreturn=False)
     
     def get_auto_play_state(self):
         """获取自动播放状态"""
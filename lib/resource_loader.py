@@ -12,10 +12,249 @@ Resource Loader Module
 - ResourceLoader: 资源加载器，提供统一的资源加载接口
 """
 
+import hashlib
+import mmap
+import os
+import struct
+import queue
+import threading
+import weakref
 import pygame
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, Optional, Tuple
-from .paths import resource_dir
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from .paths import cache_dir, resource_dir
+
+
+# 灰度转换权重：0.299/0.587/0.114 × 256（R/G/B，三者之和正好为 256，乘积不超出 uint16）
+GRAY_WEIGHTS = (77, 150, 29)
+
+# 并行解码PNG的线程数
+IMAGE_LOAD_WORKERS = 8
+
+# 缩放比例高于此值（且不放大）时使用最近邻缩放，足够接近原尺寸，画质差别看不出来
+FAST_SCALE_MIN_RATIO = 0.8
+
+# 磁盘图片缓存版本：图片处理方式（缩放、灰度、皇冠切分、图集打包等）改变时必须加一，
+# 旧版本的缓存文件会在重新生成时被删除
+IMAGE_CACHE_VERSION = 1
+
+# 磁盘图片缓存文件头：宽、高（小端 uint32），之后是紧密排列的 RGBA 像素
+IMAGE_CACHE_HEADER = struct.Struct('<II')
+
+# 数字图集缓存中每个字形的尺寸：宽、高（小端 uint32）
+GLYPH_SIZE = struct.Struct('<II')
+
+# 图片加载描述：(图片路径, 目标高度(0表示不缩放), 变体)
+ImageSpec = Tuple[Path, int, str]
+
+# 所有 ResourceLoader 实例共享的图片池：加载描述 → [引用计数, 图片]
+_IMAGE_POOL: Dict[ImageSpec, list] = {}
+
+# 共享池中数字图集的字形尺寸：加载描述 → [(宽, 高), ...]
+_GLYPH_ATLAS_SIZES: Dict[ImageSpec, List[Tuple[int, int]]] = {}
+
+
+def _acquire(spec: ImageSpec) -> Optional[pygame.Surface]:
+    """
+    从共享图片池取出图片并增加引用计数
+    
+    Args:
+        spec: (图片路径, 目标高度, 变体)
+        
+    Returns:
+        pygame.Surface: 池中的图片，不在池中时返回 None
+    """
+    entry = _IMAGE_POOL.get(spec)
+    if entry is None:
+        return None
+    entry[0] += 1
+    return entry[1]
+
+
+def _share(spec: ImageSpec, surface: pygame.Surface) -> pygame.Surface:
+    """
+    把新加载的图片放入共享图片池并持有一个引用
+    
+    如果其他加载器已经放入了同一张图片，改用池中的那张（丢弃新加载的）
+    
+    Args:
+        spec: (图片路径, 目标高度, 变体)
+        surface: 新加载的图片
+        
+    Returns:
+        pygame.Surface: 池中的图片
+    """
+    entry = _IMAGE_POOL.get(spec)
+    if entry is None:
+        _IMAGE_POOL[spec] = [1, surface]
+        return surface
+    entry[0] += 1
+    return entry[1]
+
+
+def _release(specs: Iterable[ImageSpec]):
+    """
+    释放一组图片引用，引用计数归零的图片从共享图片池中移除
+    
+    Args:
+        specs: 要释放的加载描述（同一描述可出现多次，每次释放一个引用）
+    """
+    for spec in specs:
+        entry = _IMAGE_POOL.get(spec)
+        if entry is None:
+            continue
+        entry[0] -= 1
+        if entry[0] <= 0:
+            del _IMAGE_POOL[spec]
+
+
+class LazyImageDict:
+    """
+    按需加载的图片表
+    Lazily loaded image mapping
+    
+    只提供调用方实际使用的 in、[]、get 和 len，不是 dict 子类，也不支持遍历：
+    遍历只能看到已加载的图片，结果会随加载时机变化。
+    
+    先用 register() 登记每个键的加载描述，图片在第一次被访问（[]、in、get）时
+    才通过资源加载器解码、缩放，之后缓存起来。
+    加载失败的键会被移除，表现得和从未加载成功的图片一样（不在表中）
+    
+    register_glyphs() 登记的一组数字图片打包成一张图集，访问其中任意一张时整组一起加载
+    
+    start_prefetch() 启动后台线程预先解码还未访问的图片，
+    主循环每帧调用 pump() 在主线程完成其中一张的转换和缩放
+    """
+    
+    def __init__(self, loader: 'ResourceLoader'):
+        """
+        Args:
+            loader: 负责实际读取和处理图片的资源加载器
+        """
+        self._images: Dict[Any, pygame.Surface] = {}
+        self._loader = loader
+        self._specs: Dict[Any, ImageSpec] = {}
+        self._glyph_groups: Dict[Any, Tuple[Dict[Any, Path], int]] = {}
+        self._prefetch_queue: Optional[queue.Queue] = None
+    
+    def register(self, key, spec: ImageSpec):
+        """
+        登记一张图片（源文件不存在时忽略）
+        
+        Args:
+            key: 字典键
+            spec: (图片路径, 目标高度, 变体)
+        """
+        if spec[0].exists():
+            self._specs[key] = spec
+    
+    def register_glyphs(self, paths: Dict[Any, Path], target_height: int):
+        """
+        登记一组数字图片，加载时打包成一张图集（见 ResourceLoader._load_glyph_atlas）
+        
+        Args:
+            paths: 字典键 → 图片路径（不存在的文件会被忽略）
+            target_height: 目标高度（保持宽高比缩放），0 表示不缩放
+        """
+        group = ({key: path for key, path in paths.items() if path.exists()}, target_height)
+        for key in group[0]:
+            self._glyph_groups[key] = group
+    
+    def _load_glyph_group(self, key):
+        """加载 key 所在的整组数字图片"""
+        paths, target_height = self._glyph_groups[key]
+        for group_key in paths:
+            del self._glyph_groups[group_key]
+        glyphs = self._loader._load_glyph_atlas(list(paths.values()), target_height)
+        for group_key, path in paths.items():
+            img = glyphs.get(path)
+            if img is not None:
+                self._images[group_key] = img
+    
+    def __getitem__(self, key) -> pygame.Surface:
+        img = self._images.get(key)
+        if img is not None:
+            return img
+        if key in self._glyph_groups:
+            self._load_glyph_group(key)
+            return self._images[key]
+        spec = self._specs.pop(key, None)
+        if spec is None:
+            raise KeyError(key)
+        img = self._loader._acquire_image(spec)
+        if img is None:
+            img = self._loader._finish_image(spec, self._loader._fetch_image(spec))
+        if img is None:
+            raise KeyError(key)
+        self._images[key] = img
+        return img
+    
+    def __contains__(self, key) -> bool:
+        if key in self._images:
+            return True
+        if key not in self._specs and key not in self._glyph_groups:
+            return False
+        # 调用方总是先判断 in 再取值，这里顺便加载，失败的键不算在表中
+        try:
+            self[key]
+        except KeyError:
+            return False
+        return True
+    
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+    
+    def __len__(self) -> int:
+        """已加载和已登记（尚未加载）的图片总数"""
+        return len(self._images) + len(self._specs) + len(self._glyph_groups)
+    
+    def start_prefetch(self):
+        """
+        启动后台预取线程（只会启动一次）
+        
+        线程只做不依赖显示表面的读取和PNG解码，结果放入队列等待 pump() 处理
+        """
+        if self._prefetch_queue is not None:
+            return
+        self._prefetch_queue = queue.Queue()
+        pending = list(self._specs.items())
+        threading.Thread(target=self._prefetch, args=(pending,), daemon=True).start()
+    
+    def _prefetch(self, pending):
+        """后台线程：依次读取/解码登记的图片"""
+        for key, spec in pending:
+            self._prefetch_queue.put((key, self._loader._fetch_image(spec)))
+    
+    def pump(self, max_items: int = 1):
+        """
+        在主线程处理预取好的图片（convert_alpha 等必须在主线程进行）
+        
+        Args:
+            max_items: 本次最多处理的图片数量
+        """
+        if self._prefetch_queue is None:
+            return
+        for _ in range(max_items):
+            try:
+                key, fetched = self._prefetch_queue.get_nowait()
+            except queue.Empty:
+                # 单张图片都处理完后，再逐组加载数字图集（只读一个缓存文件，直接在主线程进行）
+                if self._glyph_groups:
+                    self._load_glyph_group(next(iter(self._glyph_groups)))
+                return
+            spec = self._specs.pop(key, None)
+            if spec is None:
+                # 在预取完成前已经被按需加载过了
+                continue
+            img = self._loader._acquire_image(spec)
+            if img is None:
+                img = self._loader._finish_image(spec, fetched)
+            if img is not None:
+                self._images[key] = img
 
 
 class ResourceLoader:
@@ -37,15 +276,375 @@ class ResourceLoader:
         self.result_texture_path = self.res_path / 'Texture' / 'result'  # 结算画面资源路径
         self.font_path = self.res_path / 'FZPangWaUltra-Regular.ttf'
         self.custom_resource_path = resource_dir()  # 自定义资源文件夹
+        self.image_cache_path = cache_dir() / 'images'  # 处理后图片的磁盘缓存
         
         # ==================== 缓存 ====================
         self._diff_images_cache = None      # 难度图标缓存
         self._bg_images_cache = None       # 背景图片缓存
         self._fonts_cache = {}             # 字体缓存
+        self._scaled_sheet_cache = {}      # 缩放后的整张图集缓存（皇冠三张共用一次缩放）
+        self._pool_refs: List[ImageSpec] = []  # 本实例持有的共享图片池引用
+        # 加载器被回收时自动释放持有的引用（clear_cache 会提前释放并清空列表）
+        weakref.finalize(self, _release, self._pool_refs)
         
         # ==================== 图标尺寸设置 ====================
         self.target_height = 45  # 统一图标高度，保持宽高比
     
+    @staticmethod
+    def _decode_images(paths: Iterable[Path]) -> Dict[Path, Future]:
+        """
+        并行解码一组图片文件
+        Decode a batch of image files in parallel
+        
+        PNG解码（pygame.image.load）在线程池中进行；返回时全部解码已完成。
+        convert_alpha / smoothscale 等依赖显示表面的处理仍由调用者在主线程完成，
+        解码失败的异常在调用者取 result() 时抛出
+        
+        Args:
+            paths: 图片路径（不存在的文件会被跳过）
+            
+        Returns:
+            Dict[Path, Future]: 存在的图片路径 → 解码结果（未转换的 pygame 表面）
+        """
+        existing = [path for path in paths if path.exists()]
+        with ThreadPoolExecutor(max_workers=IMAGE_LOAD_WORKERS) as executor:
+            return {path: executor.submit(pygame.image.load, str(path)) for path in existing}
+    
+    def _cache_file(self, identity: str, state: str) -> Path:
+        """
+        计算磁盘缓存文件路径
+        
+        文件名为 "<identity哈希>-<state哈希>.rgba"：identity 区分是哪张图片，
+        state 包含源文件修改时间和缓存版本，写入新文件时同一 identity 的旧文件会被删除
+        
+        Args:
+            identity: 图片身份（路径、目标高度、变体）
+            state: 图片状态（源文件修改时间等）
+            
+        Returns:
+            Path: 缓存文件路径
+        """
+        identity_key = hashlib.sha1(identity.encode('utf-8')).hexdigest()[:20]
+        state_key = hashlib.sha1(f"{state}|v{IMAGE_CACHE_VERSION}".encode('utf-8')).hexdigest()[:20]
+        return self.image_cache_path / f'{identity_key}-{state_key}.rgba'
+    
+    @staticmethod
+    def _is_cacheable(spec: ImageSpec) -> bool:
+        """
+        判断图片是否值得写入磁盘缓存
+        
+        不缩放的原图只能省去PNG解码，原始RGBA却比PNG大几十倍（result_0.png 48KB → 2.4MB），不缓存
+        """
+        return bool(spec[1] or spec[2])
+    
+    def _image_cache_file(self, spec: ImageSpec) -> Path:
+        """
+        计算图片在磁盘缓存中的文件路径
+        
+        缓存key包含源文件路径、修改时间、目标高度、变体和缓存版本，源文件或处理方式更新后自动失效
+        
+        Args:
+            spec: (图片路径, 目标高度, 变体)
+            
+        Returns:
+            Path: 缓存文件路径
+        """
+        path, target_height, variant = spec
+        return self._cache_file(f"{path}|{target_height}|{variant}", str(path.stat().st_mtime_ns))
+    
+    @staticmethod
+    def _write_cache_file(cache_file: Path, chunks: Iterable[bytes]):
+        """
+        写入磁盘缓存文件（先写临时文件再替换），并删除同一图片的旧缓存文件
+        
+        Args:
+            cache_file: 缓存文件路径（_cache_file 的返回值）
+            chunks: 依次写入的数据
+            
+        Raises:
+            OSError: 写入失败
+        """
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = cache_file.with_suffix('.tmp')
+        with open(tmp_file, 'wb') as f:
+            for chunk in chunks:
+                f.write(chunk)
+        os.replace(tmp_file, cache_file)
+        
+        # 源文件更新或缓存版本变化后留下的旧文件
+        identity_key = cache_file.name.split('-', 1)[0]
+        for stale_file in cache_file.parent.glob(f'{identity_key}-*.rgba'):
+            if stale_file != cache_file:
+                try:
+                    stale_file.unlink()
+                except OSError:
+                    pass
+    
+    @staticmethod
+    def _map_cache_file(cache_file: Path) -> memoryview:
+        """
+        以只读方式 mmap 磁盘缓存文件
+        
+        返回的内存视图直接映射文件内容，切片和 frombuffer 都不会复制数据；
+        映射在最后一个引用（包括 frombuffer 得到的表面）释放后自动解除
+        
+        Args:
+            cache_file: 缓存文件路径
+            
+        Returns:
+            memoryview: 文件内容，文件不存在或为空时返回空视图
+        """
+        try:
+            with open(cache_file, 'rb') as f:
+                return memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+        except (OSError, ValueError):
+            # 空文件无法 mmap（ValueError）
+            return memoryview(b'')
+    
+    def _read_image_cache(self, spec: ImageSpec) -> Optional[pygame.Surface]:
+        """
+        从磁盘缓存读取处理好的图片（原始RGBA像素，跳过PNG解码和缩放）
+        
+        Args:
+            spec: (图片路径, 目标高度, 变体)
+            
+        Returns:
+            pygame.Surface: 缓存的图片（尚未 convert_alpha），未命中或缓存损坏时返回 None
+        """
+        if not self._is_cacheable(spec):
+            return None
+        try:
+            data = self._map_cache_file(self._image_cache_file(spec))
+        except OSError:
+            return None
+        if len(data) < IMAGE_CACHE_HEADER.size:
+            return None
+        width, height = IMAGE_CACHE_HEADER.unpack_from(data)
+        if len(data) != IMAGE_CACHE_HEADER.size + width * height * 4:
+            return None
+        # frombuffer 直接引用映射的文件内容，调用者 convert_alpha 时才复制成独立的显示格式表面
+        # 不依赖显示表面，可以在后台线程中调用
+        return pygame.image.frombuffer(data[IMAGE_CACHE_HEADER.size:], (width, height), 'RGBA')
+    
+    def _write_image_cache(self, spec: ImageSpec, surface: pygame.Surface):
+        """
+        将处理好的图片写入磁盘缓存（不缩放的原图不缓存；写入失败时跳过，下次重新生成）
+        
+        Args:
+            spec: (图片路径, 目标高度, 变体)
+            surface: 处理好的图片
+        """
+        if not self._is_cacheable(spec):
+            return
+        try:
+            self._write_cache_file(self._image_cache_file(spec), [
+                IMAGE_CACHE_HEADER.pack(*surface.get_size()),
+                pygame.image.tostring(surface, 'RGBA'),
+            ])
+        except OSError as e:
+            print(f"Failed to write image cache for {spec[0]}: {e}")
+    
+    @staticmethod
+    def _fast_scale(img: pygame.Surface, new_size: Tuple[int, int]) -> pygame.Surface:
+        """
+        缩放图片：接近原尺寸的缩小用最近邻（scale），其余用双线性（smoothscale）
+        
+        Args:
+            img: 原图
+            new_size: 目标尺寸 (宽, 高)
+            
+        Returns:
+            pygame.Surface: 缩放后的图片
+        """
+        orig_w, orig_h = img.get_size()
+        ratio = max(new_size[0] / orig_w, new_size[1] / orig_h)
+        if FAST_SCALE_MIN_RATIO < ratio <= 1:
+            return pygame.transform.scale(img, new_size)
+        return pygame.transform.smoothscale(img, new_size)
+    
+    def _scale_to_height(self, img: pygame.Surface, target_height: int) -> pygame.Surface:
+        """保持宽高比缩放到目标高度"""
+        orig_w, orig_h = img.get_size()
+        scale = target_height / orig_h
+        new_w = int(orig_w * scale)
+        return self._fast_scale(img, (new_w, target_height))
+    
+    def _process_image(self, img: pygame.Surface, path: Path, target_height: int, variant: str) -> pygame.Surface:
+        """
+        对解码后的图片做缩放等处理
+        
+        Args:
+            img: 已 convert_alpha 的原始图片
+            path: 图片路径（用于共享整张图集的缩放结果）
+            target_height: 目标高度（保持宽高比缩放），0 表示不缩放
+            variant: 变体：'' 原图，'gray' 灰度版本，'crown0'~'crown2' 皇冠图中的第几个
+            
+        Returns:
+            pygame.Surface: 处理后的图片
+        """
+        if variant.startswith('crown'):
+            # 皇冠是横向并排的三张：整张图只缩放一次，再取出其中一张（子表面，不复制）
+            sheet_key = (path, target_height)
+            sheet = self._scaled_sheet_cache.get(sheet_key)
+            if sheet is None:
+                sheet = self._scale_to_height(img, target_height) if target_height else img
+                self._scaled_sheet_cache[sheet_key] = sheet
+            crown_type = int(variant[len('crown'):])
+            crown_width = sheet.get_width() // 3
+            return sheet.subsurface(pygame.Rect(crown_type * crown_width, 0, crown_width, sheet.get_height()))
+        
+        if target_height:
+            img = self._scale_to_height(img, target_height)
+        
+        if variant == 'gray':
+            # 创建黑白版本（用于缺失的难度）
+            if not target_height:
+                img = img.copy()
+            arr = pygame.surfarray.pixels3d(img)
+            # 使用标准灰度转换公式（0.299/0.587/0.114 的 8 位定点形式）
+            # 在一个 uint16 数组上原地乘加，只有单通道大小的临时数组
+            weight_r, weight_g, weight_b = GRAY_WEIGHTS
+            gray = arr[:, :, 0].astype('uint16')
+            gray *= weight_r
+            gray += arr[:, :, 1].astype('uint16') * weight_g
+            gray += arr[:, :, 2].astype('uint16') * weight_b
+            gray >>= 8
+            arr[:, :, :] = gray[:, :, None]
+            del arr
+        
+        return img
+    
+    def _load_images(self, specs: Iterable[ImageSpec]) -> Dict[ImageSpec, pygame.Surface]:
+        """
+        批量加载并处理图片
+        Load and process a batch of images
+        
+        1. 先查共享图片池（其他加载器已加载的），再查磁盘缓存，命中的图片直接使用（无需解码、缩放）
+        2. 未命中的源文件并行解码（同一文件只解码一次）
+        3. 主线程中转换、缩放、灰度化，并写入磁盘缓存和共享图片池
+        
+        Args:
+            specs: (图片路径, 目标高度, 变体) 序列
+            
+        Returns:
+            Dict[ImageSpec, pygame.Surface]: 成功加载的图片（不存在或加载失败的不包含在内）
+        """
+        results = {}
+        pending = []
+        for spec in specs:
+            if not spec[0].exists():
+                continue
+            pooled = self._acquire_image(spec)
+            if pooled is not None:
+                results[spec] = pooled
+                continue
+            cached = self._read_image_cache(spec)
+            if cached is not None:
+                results[spec] = self._share_image(spec, cached.convert_alpha())
+            else:
+                pending.append(spec)
+        
+        decoded = self._decode_images(dict.fromkeys(spec[0] for spec in pending))
+        for spec in pending:
+            path, target_height, variant = spec
+            try:
+                img = decoded[path].result().convert_alpha()
+                img = self._process_image(img, path, target_height, variant)
+            except Exception as e:
+                print(f"Failed to load {path}: {e}")
+                continue
+            results[spec] = self._share_image(spec, img)
+            self._write_image_cache(spec, img)
+        
+        return results
+    
+    def _load_glyph_atlas(self, paths: List[Path], target_height: int) -> Dict[Path, pygame.Surface]:
+        """
+        加载一组数字图片，打包成一张横向图集后切成子表面
+        Load a set of digit glyphs packed into a single atlas
+        
+        图集整体写入磁盘缓存（文件头后依次是每个字形的宽高，再是 RGBA 像素），
+        之后启动只需读一个文件、一次 convert_alpha，不必分别解码十个PNG
+        
+        Args:
+            paths: 图片路径（不存在的文件会被跳过）
+            target_height: 目标高度（保持宽高比缩放），0 表示不缩放
+            
+        Returns:
+            Dict[Path, pygame.Surface]: 图片路径 → 图集中对应的子表面（加载失败的不包含在内）
+        """
+        paths = [path for path in paths if path.exists()]
+        if not paths:
+            return {}
+        spec = (paths[0], target_height, 'glyphs')
+        atlas = _acquire(spec)
+        if atlas is not None:
+            self._pool_refs.append(spec)
+        sizes = None
+        
+        # 缓存key包含全部源文件的路径、修改时间和缓存版本
+        cache_file = self._cache_file(
+            '|'.join(map(str, paths)) + f"|{target_height}|glyphs",
+            '|'.join(str(path.stat().st_mtime_ns) for path in paths),
+        )
+        header_size = IMAGE_CACHE_HEADER.size + GLYPH_SIZE.size * len(paths)
+        
+        if atlas is None:
+            data = self._map_cache_file(cache_file)
+            if len(data) >= header_size:
+                width, height = IMAGE_CACHE_HEADER.unpack_from(data)
+                if len(data) == header_size + width * height * 4:
+                    sizes = [GLYPH_SIZE.unpack_from(data, IMAGE_CACHE_HEADER.size + GLYPH_SIZE.size * i)
+                             for i in range(len(paths))]
+                    atlas = pygame.image.frombuffer(data[header_size:], (width, height), 'RGBA').convert_alpha()
+                    atlas = self._share_image(spec, atlas)
+        
+        if atlas is None:
+            # 未命中缓存：并行解码，逐张缩放后打包
+            decoded = self._decode_images(paths)
+            glyphs = []
+            for path in paths:
+                try:
+                    img = decoded[path].result().convert_alpha()
+                    glyphs.append(self._process_image(img, path, target_height, ''))
+                except Exception as e:
+                    print(f"Failed to load {path}: {e}")
+                    glyphs.append(None)
+            sizes = [img.get_size() if img is not None else (0, 0) for img in glyphs]
+            width = sum(w for w, _ in sizes)
+            height = max(h for _, h in sizes)
+            if not height:
+                return {}
+            atlas = pygame.Surface((width, height), pygame.SRCALPHA)
+            # BLEND_RGBA_MAX 叠到全透明底上等于原样复制像素（普通 alpha 混合会把半透明边缘变暗）
+            x = 0
+            for img, (w, _) in zip(glyphs, sizes):
+                if img is not None:
+                    atlas.blit(img, (x, 0), special_flags=pygame.BLEND_RGBA_MAX)
+                x += w
+            try:
+                self._write_cache_file(cache_file, [
+                    IMAGE_CACHE_HEADER.pack(width, height),
+                    *(GLYPH_SIZE.pack(*size) for size in sizes),
+                    pygame.image.tostring(atlas, 'RGBA'),
+                ])
+            except OSError as e:
+                print(f"Failed to write image cache for {paths[0].parent}: {e}")
+            atlas = self._share_image(spec, atlas)
+        
+        if sizes is None:
+            # 图集来自共享池，字形尺寸在放入池时已记录
+            sizes = _GLYPH_ATLAS_SIZES[spec]
+        _GLYPH_ATLAS_SIZES[spec] = sizes
+        
+        results = {}
+        x = 0
+        for path, (w, h) in zip(paths, sizes):
+            if w:
+                results[path] = atlas.subsurface(pygame.Rect(x, 0, w, h))
+            x += w
+        return results
+    
     def load_difficulty_images(self) -> Dict[str, pygame.Surface]:
         """
         加载难度图标和返回按钮图片
@@ -62,146 +661,109 @@ class ResourceLoader:
         3. 为每个难度图标创建灰度版本
         4. 处理加载失败的情况
         
+        这里只登记各图片的加载描述，图片在第一次被访问或后台预取后才解码、缩放（见 LazyImageDict）
+        
         Returns:
-            Dict[str, pygame.Surface]: 图片字典，键为图片名称，值为pygame表面
+            LazyImageDict: 图片字典，键为图片名称，值为pygame表面
         """
         # 使用缓存避免重复加载
         if self._diff_images_cache is not None:
             return self._diff_images_cache
         
-        images = {}
+        texture_path = self.texture_path
+        target_height = self.target_height
+        # 星星：增大30%再减少10%: 0.5 * 1.3 * 0.9 = 0.585
+        star_height = int(target_height * 0.585)
+        # 数字：增大30%再减少10%: 0.4 * 1.3 * 0.9 = 0.468
+        num_height = int(target_height * 0.468)
+        # 皇冠：高度为难度图标的140%（放大100%）
+        crown_height = int(target_height * 1.4)
+        crown_path = texture_path / 'Crown.png'
         
-        # ==================== 加载难度图标 ====================
-        # Load images for difficulty levels 1-5
+        images = LazyImageDict(self)
+        # 难度图标及其灰度版本 (lv_1.png - lv_5.png)
         for i in range(1, 6):
-            img_path = self.texture_path / f'lv_{i}.png'
-            if img_path.exists():
-                try:
-                    # 加载原始图片
-                    img = pygame.image.load(str(img_path)).convert_alpha()
-                    
-                    # 保持宽高比缩放
-                    orig_w, orig_h = img.get_size()
-                    scale = self.target_height / orig_h
-                    new_w = int(orig_w * scale)
-                    img = pygame.transform.smoothscale(img, (new_w, self.target_height))
-                    images[i] = img
-                    
-                    # ==================== 创建灰度版本 ====================
-                    # 创建黑白版本（用于缺失的难度）
-                    gray_img = img.copy()
-                    arr = pygame.surfarray.pixels3d(gray_img)
-                    # 使用标准灰度转换公式
-                    gray = (arr[:,:,0] * 0.299 + arr[:,:,1] * 0.587 + arr[:,:,2] * 0.114).astype('uint8')
-                    arr[:,:,0] = gray
-                    arr[:,:,1] = gray
-                    arr[:,:,2] = gray
-                    del arr
-                    images[f'{i}_gray'] = gray_img
-                    
-                except Exception as e:
-                    print(f"Failed to load {img_path}: {e}")
-        
-        # ==================== 加载返回按钮 ====================
-        # Load back button images
+            lv_path = texture_path / f'lv_{i}.png'
+            images.register(i, (lv_path, target_height, ''))
+            images.register(f'{i}_gray', (lv_path, target_height, 'gray'))
+        # 返回按钮 (back_1.png, back_2.png)
         for name in ['back_1', 'back_2']:
-            img_path = self.texture_path / f'{name}.png'
-            if img_path.exists():
-                try:
-                    # 加载返回按钮图片
-                    img = pygame.image.load(str(img_path)).convert_alpha()
-                    
-                    # 保持宽高比缩放
-                    orig_w, orig_h = img.get_size()
-                    scale = self.target_height / orig_h
-                    new_w = int(orig_w * scale)
-                    img = pygame.transform.smoothscale(img, (new_w, self.target_height))
-                    images[name] = img
-                    
-                except Exception as e:
-                    print(f"Failed to load {img_path}: {e}")
-        
-        # ==================== 加载彩色星星图标 ====================
-        # Load colored star images for each difficulty (lv_s_1.png - lv_s_5.png)
+            images.register(name, (texture_path / f'{name}.png', target_height, ''))
+        # 彩色星星图标 (lv_s_1.png - lv_s_5.png)
         for i in range(1, 6):
-            star_path = self.texture_path / f'lv_s_{i}.png'
-            if star_path.exists():
-                try:
-                    star_img = pygame.image.load(str(star_path)).convert_alpha()
-                    # Scale to match difficulty icon height (增大30%再减少10%: 0.5 * 1.3 * 0.9 = 0.585)
-                    orig_w, orig_h = star_img.get_size()
-                    scale = (self.target_height * 0.585) / orig_h
-                    new_w = int(orig_w * scale)
-                    star_img = pygame.transform.smoothscale(star_img, (new_w, int(self.target_height * 0.585)))
-                    images[f'star_{i}'] = star_img
-                    print(f"Loaded star image: lv_s_{i}.png")
-                except Exception as e:
-                    print(f"Failed to load {star_path}: {e}")
-        
-        # ==================== 加载数字图片 ====================
-        # Load number images (SN_01.png - SN_10.png)
-        for n in range(1, 11):
-            num_filename = f'SN_{n:02d}.png'
-            num_path = self.texture_path / num_filename
-            if num_path.exists():
-                try:
-                    num_img = pygame.image.load(str(num_path)).convert_alpha()
-                    # Scale numbers to match star height (增大30%再减少10%: 0.4 * 1.3 * 0.9 = 0.468)
-                    orig_w, orig_h = num_img.get_size()
-                    scale = (self.target_height * 0.468) / orig_h
-                    new_w = int(orig_w * scale)
-                    num_img = pygame.transform.smoothscale(num_img, (new_w, int(self.target_height * 0.468)))
-                    images[f'num_{n}'] = num_img
-                    print(f"Loaded number image: {num_filename}")
-                except Exception as e:
-                    print(f"Failed to load {num_path}: {e}")
-        
-        # ==================== 加载星星背景矩形 ====================
-        # Load star background rectangles (lv_SB_1.png, lv_SB_2.png)
+            images.register(f'star_{i}', (texture_path / f'lv_s_{i}.png', star_height, ''))
+        # 数字图片 (SN_01.png - SN_10.png)
+        images.register_glyphs(
+            {f'num_{n}': texture_path / f'SN_{n:02d}.png' for n in range(1, 11)}, num_height
+        )
+        # 星星背景矩形 (lv_SB_1.png, lv_SB_2.png)，不缩放，使用原始尺寸
         for sb_i in [1, 2]:
-            sb_path = self.texture_path / f'lv_SB_{sb_i}.png'
-            if sb_path.exists():
-                try:
-                    sb_img = pygame.image.load(str(sb_path)).convert_alpha()
-                    # Don't scale SB images, use original size
-                    images[f'sb_{sb_i}'] = sb_img
-                    print(f"Loaded SB image: lv_SB_{sb_i}.png (size: {sb_img.get_width()}x{sb_img.get_height()})")
-                except Exception as e:
-                    print(f"Failed to load {sb_path}: {e}")
-        
-        # ==================== 加载皇冠图标 ====================
-        # Load crown images (Crown.png - 3 crowns in one image)
-        crown_path = self.texture_path / 'Crown.png'
-        if crown_path.exists():
-            try:
-                crown_sheet = pygame.image.load(str(crown_path)).convert_alpha()
-                sheet_width, sheet_height = crown_sheet.get_size()
-                
-                # 皇冠是横向并排的三张，拆分成单独的三个图标
-                # 0: 过关(分数>6000), 1: 全连(Full Combo), 2: 全P的全连(All Perfect)
-                crown_width = sheet_width // 3
-                
-                for crown_type in range(3):
-                    # 提取单个皇冠
-                    crown_rect = pygame.Rect(crown_type * crown_width, 0, crown_width, sheet_height)
-                    crown_img = crown_sheet.subsurface(crown_rect).copy()
-                    
-                    # 缩放皇冠到合适大小（高度为难度图标的140%，放大100%）
-                    target_crown_height = int(self.target_height * 1.4)
-                    scale = target_crown_height / sheet_height
-                    new_crown_width = int(crown_width * scale)
-                    crown_img = pygame.transform.smoothscale(crown_img, (new_crown_width, target_crown_height))
-                    
-                    images[f'crown_{crown_type}'] = crown_img
-                
-                print(f"Loaded crown images from Crown.png (3 types, size: {new_crown_width}x{target_crown_height})")
-            except Exception as e:
-                print(f"Failed to load {crown_path}: {e}")
+            images.register(f'sb_{sb_i}', (texture_path / f'lv_SB_{sb_i}.png', 0, ''))
+        # 皇冠图标 (Crown.png 一张图中横向并排三个)
+        # 0: 过关(分数>6000), 1: 全连(Full Combo), 2: 全P的全连(All Perfect)
+        for crown_type in range(3):
+            images.register(f'crown_{crown_type}', (crown_path, crown_height, f'crown{crown_type}'))
         
         # 缓存结果
         self._diff_images_cache = images
         return images
     
+    def _acquire_image(self, spec: ImageSpec) -> Optional[pygame.Surface]:
+        """从共享图片池取图片（其他加载器已加载过的不再重复加载），本实例持有引用"""
+        img = _acquire(spec)
+        if img is not None:
+            self._pool_refs.append(spec)
+        return img
+    
+    def _share_image(self, spec: ImageSpec, img: pygame.Surface) -> pygame.Surface:
+        """把本实例加载的图片放入共享图片池，本实例持有引用"""
+        self._pool_refs.append(spec)
+        return _share(spec, img)
+    
+    def _fetch_image(self, spec: ImageSpec) -> Optional[Tuple[pygame.Surface, bool]]:
+        """
+        读取单张图片：优先读磁盘缓存，否则解码PNG（不依赖显示表面，可在后台线程调用）
+        
+        Args:
+            spec: (图片路径, 目标高度, 变体)
+            
+        Returns:
+            Tuple[pygame.Surface, bool]: (未转换的图片, 是否来自磁盘缓存)，加载失败时返回 None
+        """
+        try:
+            cached = self._read_image_cache(spec)
+            if cached is not None:
+                return cached, True
+            return pygame.image.load(str(spec[0])), False
+        except Exception as e:
+            print(f"Failed to load {spec[0]}: {e}")
+            return None
+    
+    def _finish_image(self, spec: ImageSpec,
+                      fetched: Optional[Tuple[pygame.Surface, bool]]) -> Optional[pygame.Surface]:
+        """
+        在主线程完成 _fetch_image 读取的图片：转换格式，未缓存的还要缩放处理并写入磁盘缓存
+        
+        Args:
+            spec: (图片路径, 目标高度, 变体)
+            fetched: _fetch_image 的返回值
+            
+        Returns:
+            pygame.Surface: 处理后的图片，加载失败时返回 None
+        """
+        if fetched is None:
+            return None
+        img, from_cache = fetched
+        try:
+            img = img.convert_alpha()
+            if not from_cache:
+                img = self._process_image(img, *spec)
+                self._write_image_cache(spec, img)
+        except Exception as e:
+            print(f"Failed to load {spec[0]}: {e}")
+            return None
+        return self._share_image(spec, img)
+    
     def load_background_images(self) -> Dict[str, pygame.Surface]:
         """
         加载歌曲按钮背景图片
@@ -226,29 +788,31 @@ class ResourceLoader:
         
         images = {}
         
+        # 本方法的图片都不缩放，不写磁盘缓存（见 _is_cacheable），只并行解码
+        nu_path = self.res_path / 'Texture' / 'nu'
+        big_paths = {i: self.texture_path / f'big_{i}.png' for i in (1, 3)}
+        glow_paths = [self.texture_path / f'big_2_{i}.png' for i in range(1, 3)]
+        shadow_path = self.custom_resource_path / 'b1_0.png'
+        scores_path = self.texture_path / 'scores.png'
+        number_paths = [nu_path / f'n 4 {i:02d}.png' for i in range(10)]
+        loaded = self._load_images(
+            (path, 0, '')
+            for path in [*big_paths.values(), *glow_paths, shadow_path, scores_path]
+        )
+        
         # ==================== 加载背景图片 ====================
         # 加载 big_1.png 和 big_3.png
-        for i in [1, 3]:
-            img_path = self.texture_path / f'big_{i}.png'
-            if img_path.exists():
-                try:
-                    # 加载背景图片，保持透明度
-                    img = pygame.image.load(str(img_path)).convert_alpha()
-                    images[i] = img
-                except Exception as e:
-                    print(f"Failed to load {img_path}: {e}")
+        for i, img_path in big_paths.items():
+            img = loaded.get((img_path, 0, ''))
+            if img is not None:
+                images[i] = img
         
         # 加载发光动画帧 big_2_1.png ~ big_2_2.png
         glow_frames = []
-        for i in range(1, 3):
-            img_path = self.texture_path / f'big_2_{i}.png'
-            if img_path.exists():
-                try:
-                    img = pygame.image.load(str(img_path)).convert_alpha()
-                    glow_frames.append(img)
-                    print(f"Loaded glow frame: big_2_{i}.png")
-                except Exception as e:
-                    print(f"Failed to load {img_path}: {e}")
+        for img_path in glow_paths:
+            img = loaded.get((img_path, 0, ''))
+            if img is not None:
+                glow_frames.append(img)
         
         # 将发光动画帧存储在 images[2] 中（作为列表）
         if glow_frames:
@@ -258,50 +822,32 @@ class ResourceLoader:
         
         # ==================== 加载投影图片 ====================
         # b1_0.png 在 songs/Resource 目录下
-        shadow_path = self.custom_resource_path / 'b1_0.png'
-        if shadow_path.exists():
-            try:
-                # 加载投影图片，保持透明度
-                shadow_img = pygame.image.load(str(shadow_path)).convert_alpha()
-                images[0] = shadow_img
-                print(f"Loaded shadow image: b1_0.png (from {shadow_path})")
-            except Exception as e:
-                print(f"Failed to load shadow image: {e}")
-        else:
+        shadow_img = loaded.get((shadow_path, 0, ''))
+        if shadow_img is not None:
+            images[0] = shadow_img
+        elif not shadow_path.exists():
             print(f"Shadow image not found at: {shadow_path}")
         
         # ==================== 加载成绩显示图片 ====================
         # scores.png 在 lib/res/Texture/selectsongs 目录下
-        scores_path = self.texture_path / 'scores.png'
-        if scores_path.exists():
-            try:
-                # 加载成绩显示图片，保持透明度
-                scores_img = pygame.image.load(str(scores_path)).convert_alpha()
-                images['scores'] = scores_img
-                print(f"Loaded scores image: scores.png")
-            except Exception as e:
-                print(f"Failed to load scores image: {e}")
-        else:
+        scores_img = loaded.get((scores_path, 0, ''))
+        if scores_img is not None:
+            images['scores'] = scores_img
+        elif not scores_path.exists():
             print(f"Warning: scores.png not found at {scores_path}")
         
         # ==================== 加载分数数字图片 ====================
-        # n 4 00.png (数字0) 到 n 4 09.png (数字9) 在 lib/res/Texture/nu 目录下
+        # n 4 00.png (数字0) 到 n 4 09.png (数字9) 在 lib/res/Texture/nu 目录下（正序）
+        # 十个数字打包成一张图集加载
+        number_glyphs = self._load_glyph_atlas(number_paths, 0)
         score_numbers = {}
-        nu_path = self.res_path / 'Texture' / 'nu'
-        
-        # 加载数字0-9 (n 4 00.png 到 n 4 09.png，正序)
-        for i in range(10):
-            num_path = nu_path / f'n 4 {i:02d}.png'
-            if num_path.exists():
-                try:
-                    num_img = pygame.image.load(str(num_path)).convert_alpha()
-                    score_numbers[i] = num_img
-                except Exception as e:
-                    print(f"Failed to load n 4 {i:02d}.png: {e}")
+        for i, num_path in enumerate(number_paths):
+            num_img = number_glyphs.get(num_path)
+            if num_img is not None:
+                score_numbers[i] = num_img
         
         if score_numbers:
             images['score_numbers'] = score_numbers
-            print(f"Loaded {len(score_numbers)} score number images")
         
         # 缓存结果
         self._bg_images_cache = images
@@ -377,14 +923,13 @@ class ResourceLoader:
         Returns:
             pygame.font.Font: 字体对象
         """
-        # 创建缓存键
-        cache_key = f"{size}_{bold}"
-        
-        # 使用缓存避免重复加载
-        if cache_key in self._fonts_cache:
-            return self._fonts_cache[cache_key]
+        # 创建缓存键（元组哈希，不用每次格式化字符串）
+        cache_key = (size, bool(bold))
         
-        font = None
+        # 使用缓存避免重复加载（一次字典查找）
+        font = self._fonts_cache.get(cache_key)
+        if font is not None:
+            return font
         
         # ==================== 优先使用自定义字体 ====================
         if self.font_path.exists():
@@ -474,62 +1019,41 @@ class ResourceLoader:
         """
         resources = {}
         
-        # 加载背景图片
         bg_path = self.result_texture_path / 'result_0.png'
-        if bg_path.exists():
-            try:
-                resources['background'] = pygame.image.load(str(bg_path)).convert_alpha()
-                print(f"Loaded result background: {bg_path}")
-            except Exception as e:
-                print(f"Failed to load {bg_path}: {e}")
+        crown_paths = [self.result_texture_path / f'crown_{i:02d}.png' for i in range(1, 4)]
+        lv_paths = [self.result_texture_path / f'lv_{i}.png' for i in range(1, 6)]
+        nu_path = self.res_path / 'Texture' / 'nu'
+        number_paths = [nu_path / f'n 2 {i:02d}.png' for i in range(10)]
+        # 皇冠图标放大50%（80像素高 * 1.5 = 120像素高），难度图标约80像素高，其余保持原始大小
+        loaded = self._load_images(
+            [(bg_path, 0, '')]
+            + [(path, 120, '') for path in crown_paths]
+            + [(path, 80, '') for path in lv_paths]
+        )
+        
+        # 加载背景图片
+        bg_img = loaded.get((bg_path, 0, ''))
+        if bg_img is not None:
+            resources['background'] = bg_img
         
         # 加载皇冠图标（放大50%）
-        for i in range(1, 4):
-            crown_path = self.result_texture_path / f'crown_{i:02d}.png'
-            if crown_path.exists():
-                try:
-                    crown_img = pygame.image.load(str(crown_path)).convert_alpha()
-                    # 缩放皇冠图标到合适大小（80像素高 * 1.5 = 120像素高）
-                    orig_w, orig_h = crown_img.get_size()
-                    target_h = 120  # 放大50%
-                    scale = target_h / orig_h
-                    new_w = int(orig_w * scale)
-                    crown_img = pygame.transform.smoothscale(crown_img, (new_w, target_h))
-                    resources[f'crown_{i:02d}'] = crown_img
-                    print(f"Loaded crown icon: crown_{i:02d}.png")
-                except Exception as e:
-                    print(f"Failed to load {crown_path}: {e}")
+        for i, crown_path in enumerate(crown_paths, start=1):
+            crown_img = loaded.get((crown_path, 120, ''))
+            if crown_img is not None:
+                resources[f'crown_{i:02d}'] = crown_img
         
         # 加载难度图标
-        for i in range(1, 6):
-            lv_path = self.result_texture_path / f'lv_{i}.png'
-            if lv_path.exists():
-                try:
-                    lv_img = pygame.image.load(str(lv_path)).convert_alpha()
-                    # 缩放难度图标到合适大小（约80像素高）
-                    orig_w, orig_h = lv_img.get_size()
-                    target_h = 80
-                    scale = target_h / orig_h
-                    new_w = int(orig_w * scale)
-                    lv_img = pygame.transform.smoothscale(lv_img, (new_w, target_h))
-                    resources[f'lv_{i}'] = lv_img
-                    print(f"Loaded difficulty icon: lv_{i}.png")
-                except Exception as e:
-                    print(f"Failed to load {lv_path}: {e}")
+        for i, lv_path in enumerate(lv_paths, start=1):
+            lv_img = loaded.get((lv_path, 80, ''))
+            if lv_img is not None:
+                resources[f'lv_{i}'] = lv_img
         
         # 加载数字图片（n 2 00.png - n 2 09.png）
-        nu_path = self.res_path / 'Texture' / 'nu'
-        for i in range(10):
-            num_filename = f'n 2 {i:02d}.png'
-            num_path = nu_path / num_filename
-            if num_path.exists():
-                try:
-                    num_img = pygame.image.load(str(num_path)).convert_alpha()
-                    # 保持原始大小
-                    resources[f'num_{i}'] = num_img
-                    print(f"Loaded number image: {num_filename}")
-                except Exception as e:
-                    print(f"Failed to load {num_path}: {e}")
+        number_glyphs = self._load_glyph_atlas(number_paths, 0)
+        for i, num_path in enumerate(number_paths):
+            num_img = number_glyphs.get(num_path)
+            if num_img is not None:
+                resources[f'num_{i}'] = num_img
         
         return resources
     
@@ -543,6 +1067,9 @@ class ResourceLoader:
         self._diff_images_cache = None
         self._bg_images_cache = None
         self._fonts_cache.clear()
+        self._scaled_sheet_cache.clear()
+        _release(self._pool_refs)
+        self._pool_refs.clear()
     
     def get_resource_info(self) -> Dict[str, any]:
         """
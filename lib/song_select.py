@@ -561,6 +561,11 @@ class SongSelectScreen:
             self.blink_time += self.clock.get_time()
             
             self._draw()
+            
+            # 首帧画出后在后台预取难度界面图片，每帧在主线程完成其中一张
+            self.diff_images.start_prefetch()
+            self.diff_images.pump()
+            
             self.clock.tick(60)
     
     
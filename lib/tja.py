@@ -26,7 +26,7 @@ class Note:
     type: int = field(init=False)
     hit_ms: float = field(init=False)
     load_ms: float = field(init=False)
-    pixels_per_frame_x: float = field(init=False)
+    pixels_per_frame_x: float = field(init=False, default=0.0)  # 默认0=不滚动，渲染时无需hasattr判断
     pixels_per_frame_y: float = field(init=False)
     display: bool = field(init=False)
     index: int = field(init=False)
@@ -36,12 +36,10 @@ class Note:
     time_signature: float = field(init=False, default=1.0)  # 拍号（如4/4=1.0, 3/4=0.75）
     is_branch_start: bool = field(init=False)
     branch_params: str = field(init=False)
-    is_super_large: bool = field(init=False)  # J/K/L/M 超大音符标记
+    is_super_large: bool = field(init=False, default=False)  # J/K/L/M 超大音符标记（类默认值，无需hasattr判断）
     
     def __post_init__(self):
         """初始化字段默认值"""
-        if not hasattr(self, 'is_super_large'):
-            self.is_super_large = False
         if not hasattr(self, 'time_signature'):
             self.time_signature = 1.0
 